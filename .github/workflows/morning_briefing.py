@@ -5,11 +5,16 @@ Sends daily motivational messages with news, quotes, and productivity tips
 """
 
 import os
+import sys
 import random
-import requests
 from datetime import datetime
 import json
 
+# Shared helpers live at the repository root.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+import http_client
+import newsapi_client
+
 # Configuration
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN', 'YOUR_BOT_TOKEN_HERE')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID', 'YOUR_CHAT_ID_HERE')
@@ -63,41 +68,16 @@ def get_news(topics, max_articles=2):
     
     news_text = "📰 *Today's News:*\n\n"
     
-    topic_keywords = {
-        'crypto': 'cryptocurrency OR bitcoin OR ethereum',
-        'ai': 'artificial intelligence OR AI OR machine learning',
-        'space': 'astronomy OR space OR NASA OR SpaceX',
-        'tech': 'technology OR startup OR innovation',
-        'stocks': 'stock market OR trading OR nasdaq',
-        'ecommerce': 'e-commerce OR online shopping OR retail'
-    }
+    results = newsapi_client.fetch_topics(NEWS_API_KEY, page_size=max_articles, timeout=10)
     
-    for topic, keywords in topic_keywords.items():
-        try:
-            url = f"https://newsapi.org/v2/everything"
-            params = {
-                'q': keywords,
-                'language': 'en',
-                'sortBy': 'publishedAt',
-                'pageSize': max_articles,
-                'apiKey': NEWS_API_KEY
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                articles = data.get('articles', [])
-                
-                if articles:
-                    news_text += f"*{topic.upper()}:*\n"
-                    for article in articles[:1]:  # One article per topic
-                        title = article.get('title', 'No title')
-                        url = article.get('url', '')
-                        news_text += f"• [{title}]({url})\n"
-                    news_text += "\n"
-        except Exception as e:
-            continue
+    for topic, articles in results.items():
+        if articles:
+            news_text += f"*{topic.upper()}:*\n"
+            for article in articles[:1]:  # One article per topic
+                title = article.get('title', 'No title')
+                url = article.get('url', '')
+                news_text += f"• [{title}]({url})\n"
+            news_text += "\n"
     
     if news_text == "📰 *Today's News:*\n\n":
         news_text += "_No news available at the moment._"
@@ -160,7 +140,7 @@ def send_telegram_message(message):
     }
     
     try:
-        response = requests.post(url, json=payload, timeout=10)
+        response = http_client.post(url, json=payload, timeout=10)
         
         if response.status_code == 200:
             print(f"✅ Message sent successfully at {datetime.now()}")
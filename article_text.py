@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Full-article enrichment for the summarizer prompt.
+Linked pages are fetched concurrently (at most ENRICH_PER_HOST at a time per
+host) and their main text is pulled out by a streaming HTML parser that stops
+once it has enough. Extracted bodies are cached by URL, and the whole stage is
+bounded by ENRICH_DEADLINE: pages still loading then are skipped this run (the
+ones already requested finish in the background and are cached for the next).
+"""
+
+import os
+import threading
+from concurrent.futures import wait
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+import http_client
+import metrics
+from budget import DaemonPool
+from cache import JsonCache
+
+ENRICH_WORKERS    = int(os.getenv("ENRICH_WORKERS", "8"))
+ENRICH_PER_HOST   = int(os.getenv("ENRICH_PER_HOST", "2"))
+ENRICH_DEADLINE   = float(os.getenv("ENRICH_DEADLINE", "2"))
+ENRICH_MAX_CHARS  = int(os.getenv("ENRICH_MAX_CHARS", "600"))   # body length passed to the prompt
+ARTICLE_CACHE_TTL = float(os.getenv("ARTICLE_CACHE_TTL", str(7 * 24 * 3600)))
+MAX_PAGE_BYTES    = 512 * 1024
+MIN_PARAGRAPH     = 40   # shorter <p> blocks are usually bylines, captions or buttons
+
+_SKIP_TAGS = {"script", "style", "noscript", "svg", "nav", "header", "footer", "aside", "form", "figure", "button"}
+
+_BLOCK_TAGS = {"p", "div", "article", "section", "main", "body", "li", "td", "blockquote"}
+
+_ARTICLES = JsonCache("articles", ttl=ARTICLE_CACHE_TTL, max_entries=1000)
+_host_slots = {}
+_host_lock = threading.Lock()
+
+
+class TextExtractor(HTMLParser):
+    """Collects paragraph text outside navigation/boilerplate, plus the page's meta description."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.paragraphs = []
+        self.description = ""
+        self.length = 0
+        self._skip = 0
+        self._para = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        elif tag == "p" and not self._skip:
+            self._end_paragraph()   # <p> may be left unclosed
+            self._para = []
+        elif tag == "meta" and not self.description:
+            attrs = dict(attrs)
+            if attrs.get("name") == "description" or attrs.get("property") == "og:description":
+                self.description = (attrs.get("content") or "").strip()
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in _BLOCK_TAGS:
+            self._end_paragraph()   # closing its container ends an unclosed <p>
+
+    def handle_data(self, data):
+        if self._para is not None and not self._skip:
+            self._para.append(data)
+
+    def _end_paragraph(self):
+        if self._para is not None:
+            text = " ".join("".join(self._para).split())
+            if len(text) >= MIN_PARAGRAPH:
+                self.paragraphs.append(text)
+                self.length += len(text) + 1
+            self._para = None
+
+    def text(self, max_chars: int) -> str:
+        body = " ".join(self.paragraphs) or self.description
+        if len(body) <= max_chars:
+            return body
+        return body[:max_chars].rsplit(" ", 1)[0] + "…"
+
+
+def extract(chunks, max_chars: int = ENRICH_MAX_CHARS, max_bytes: int = MAX_PAGE_BYTES) -> str:
+    """Main text of an HTML page given as decoded text chunks; stops reading once max_chars are found."""
+    parser = TextExtractor()
+    read = 0
+    for chunk in chunks:
+        parser.feed(chunk)
+        read += len(chunk)
+        if parser.length >= max_chars or read >= max_bytes:
+            break
+    return parser.text(max_chars)
+
+
+def _host_slot(url: str) -> threading.Semaphore:
+    host = urlsplit(url).netloc.lower()
+    with _host_lock:
+        if host not in _host_slots:
+            _host_slots[host] = threading.Semaphore(ENRICH_PER_HOST)
+        return _host_slots[host]
+
+
+def fetch_body(url: str) -> str:
+    """Extracted text of the page at url ("" if it has none), cached by URL."""
+    cached = _ARTICLES.get(url)
+    if cached is not None:
+        return cached
+    with _host_slot(url), metrics.span("article", url=url) as span:
+        r = http_client.get(url, timeout=(3, 5), stream=True)
+        try:
+            span["http"] = r.status_code
+            r.raise_for_status()
+            if "charset" not in r.headers.get("Content-Type", "").lower():
+                r.encoding = "utf-8"
+            body = extract(r.iter_content(8192, decode_unicode=True))
+            span.update(bytes=r.raw.tell(), chars=len(body))
+        finally:
+            r.close()
+    _ARTICLES.set(url, body)
+    return body
+
+
+def enrich(all_news: dict, deadline: float = ENRICH_DEADLINE) -> dict:
+    """Copy of all_news whose articles carry a "body" wherever one was extracted in time."""
+    enriched = {sector: [dict(a) for a in articles] for sector, articles in all_news.items()}
+    todo = {}
+    for articles in enriched.values():
+        for a in articles:
+            link = a.get("link", "")
+            if not link.startswith("http") or a.get("body"):
+                continue
+            cached = _ARTICLES.get(link)
+            if cached is None:
+                todo.setdefault(link, []).append(a)
+            elif cached:
+                a["body"] = cached
+    if not todo:
+        return enriched
+
+    pool = DaemonPool(ENRICH_WORKERS)
+    futures = {pool.submit(fetch_body, link): link for link in todo}
+    done, pending = wait(futures, timeout=deadline)
+    pool.shutdown()
+
+    for future in done:
+        try:
+            body = future.result()
+        except Exception as e:
+            print(f"  WARNING: article fetch failed for {futures[future]}: {e}")
+            continue
+        for a in todo[futures[future]]:
+            if body:
+                a["body"] = body
+    print(f"  Enriched {len(done)}/{len(futures)} articles ({len(pending)} missed the {deadline:.0f}s deadline)")
+    return enriched
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the brief pipeline.
+Every upstream (feeds, BM.ge, NewsAPI, OpenAI, Telegram) is served from
+bench/fixtures by a local stub server with configurable latency and failures,
+so runs are repeatable and need no network or credentials. Each benchmark
+starts from empty caches. Results are written as JSON to bench/results/ and
+compared with the previous run there.
+
+Usage: python bench/run_bench.py [--iterations 5] [--latency 0.05] [--jitter 0.02]
+                                 [--failure-rate 0] [--only fetch_rss,main] [--output PATH] [--verbose]
+"""
+
+import os
+import io
+import gc
+import sys
+import json
+import time
+import glob
+import shutil
+import argparse
+import tempfile
+import statistics
+import contextlib
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RESULTS_DIR = os.path.join(ROOT, "bench", "results")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_server import StubServer
+
+# The brief modules read their configuration at import time, so this is set
+# before they are imported. Rate limits are lifted so that Telegram's token
+# buckets don't dominate repeated runs, and since every upstream is now one
+# host, the per-host connection cap is raised to what separate hosts would get.
+BENCH_ENV = {
+    "HTTP_POOL_PER_HOST": "64",
+    "OPENAI_API_KEY": "bench",
+    "NEWS_API_KEY": "bench",
+    "TELEGRAM_BOT_TOKEN": "bench",
+    "TELEGRAM_CHAT_ID": "1",
+    "TELEGRAM_RECIPIENTS": "",
+    "TELEGRAM_RECIPIENTS_FILE": "",
+    "TELEGRAM_GLOBAL_RATE": "1000",
+    "TELEGRAM_CHAT_RATE": "1000",
+    "TELEGRAM_CHAT_BURST": "1000",
+    "STREAM_DELIVERY": "0",
+    "SEEN_TTL_DAYS": "0",
+}
+
+
+def _benchmarks(mb, en):
+    """(name, setup, run) triples; setup's result is passed to run and is not timed."""
+    def news(_):
+        return mb.get_all_news()
+
+    return [
+        ("fetch_rss", None, lambda _: mb.fetch_rss(mb.FEEDS[0]["url"], mb.FEED_CANDIDATES)),
+        ("get_all_news", None, lambda _: mb.get_all_news()),
+        ("scrape_bmge", None, lambda _: mb.scrape_bmge(mb.FEED_CANDIDATES)),
+        ("get_bmge_top_news", None, lambda _: en.get_bmge_top_news(3)),
+        ("summarize_with_openai", news, lambda all_news: mb.summarize_with_openai(all_news)),
+        ("build_message", None, lambda _: mb.build_message("*🤖 AI & Tech*\nDigest.", mb.todays_tasks())),
+        ("main", None, lambda _: _run_main(mb)),
+    ]
+
+
+def _run_main(mb):
+    argv = sys.argv
+    sys.argv = ["morning_briefing.py"]
+    try:
+        mb.main()
+    finally:
+        sys.argv = argv
+
+
+def _reset(cache_dir: str) -> None:
+    """Empty every on-disk and in-memory cache, so each run starts cold."""
+    from cache import JsonCache
+    from feed_health import HEALTH
+
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    for obj in gc.get_objects():
+        if isinstance(obj, JsonCache):
+            obj._memory.clear()
+    HEALTH.state = {}
+    HEALTH.begin_run()
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, timeout=5).stdout.strip()
+    except Exception:
+        return ""
+
+
+def _previous_results() -> dict:
+    paths = sorted(glob.glob(os.path.join(RESULTS_DIR, "bench-*.json")))
+    if not paths:
+        return {}
+    try:
+        with open(paths[-1], encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def run(args) -> dict:
+    cache_dir = tempfile.mkdtemp(prefix="brief-bench-")
+    os.environ.update(BENCH_ENV, BRIEF_CACHE_DIR=cache_dir)
+
+    import http_client
+    import morning_briefing as mb
+    import english_daily_briefing as en
+
+    server = StubServer(args.latency, args.jitter, args.failure_rate, seed=args.seed).start()
+    http_client.set_url_rewrite(server.rewrite)
+    only = set(args.only.split(",")) if args.only else None
+
+    results = {}
+    try:
+        for name, setup, fn in _benchmarks(mb, en):
+            if only and name not in only:
+                continue
+            runs, requests = [], []
+            for _ in range(args.iterations):
+                _reset(cache_dir)
+                out = sys.stdout if args.verbose else io.StringIO()
+                with contextlib.redirect_stdout(out):
+                    prepared = setup(None) if setup else None
+                    before = server.requests
+                    started = time.perf_counter()
+                    fn(prepared)
+                    runs.append(time.perf_counter() - started)
+                requests.append(server.requests - before)
+            results[name] = {
+                "runs": [round(r, 6) for r in runs],
+                "min": round(min(runs), 6),
+                "median": round(statistics.median(runs), 6),
+                "mean": round(statistics.fmean(runs), 6),
+                "max": round(max(runs), 6),
+                "requests": round(statistics.fmean(requests), 1),
+            }
+    finally:
+        http_client.set_url_rewrite(None)
+        server.stop()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "config": {
+            "iterations": args.iterations,
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "failure_rate": args.failure_rate,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+
+def print_table(report: dict, previous: dict) -> None:
+    before = previous.get("results", {}) if previous.get("config") == report["config"] else {}
+    print(f"{'benchmark':<24}{'median':>10}{'min':>10}{'max':>10}{'reqs':>7}{'vs prev':>10}")
+    for name, r in report["results"].items():
+        delta = ""
+        if name in before and before[name]["median"]:
+            delta = f"{(r['median'] / before[name]['median'] - 1) * 100:+.1f}%"
+        print(f"{name:<24}{r['median'] * 1000:>8.1f}ms{r['min'] * 1000:>8.1f}ms"
+              f"{r['max'] * 1000:>8.1f}ms{r['requests']:>7.1f}{delta:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the brief pipeline against a local stub server")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every stub response")
+    parser.add_argument("--jitter", type=float, default=0.02, help="random extra latency, up to this many seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="share of stub requests answered with 503")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", default="", help="comma-separated benchmark names")
+    parser.add_argument("--output", default="", help="result file (default: bench/results/bench-<time>.json)")
+    parser.add_argument("--verbose", action="store_true", help="show the pipeline's own output")
+    args = parser.parse_args()
+
+    previous = _previous_results()
+    report = run(args)
+    print_table(report, previous)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for every upstream the briefs talk to.
+http_client.set_url_rewrite(server.rewrite) sends https://host/path?query to
+http://127.0.0.1:<port>/host/path?query, where fixtures are served:
+
+  <feed url>                  fixtures/feeds/<host_path>.xml (fixtures/feeds/default.xml otherwise)
+  bm.ge/category/all          fixtures/bmge.html
+  newsapi.org/...             fixtures/newsapi.json
+  api.openai.com/...          fixtures/openai.json (as server-sent events when "stream" is set)
+  api.telegram.org/...        fixtures/telegram.json
+  anything else               fixtures/article.html
+
+Every response waits `latency` seconds (plus up to `jitter`), and a
+`failure_rate` share of requests get a 503.
+"""
+
+import os
+import re
+import json
+import time
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def fixture_name(host: str, path: str) -> str:
+    name = re.sub(r"[^A-Za-z0-9.]+", "_", f"{host}{path}").strip("_")
+    return name if name.endswith(".xml") else name + ".xml"
+
+
+class StubServer:
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, failure_rate: float = 0.0,
+                 seed: int = 0, fixtures: str = FIXTURES):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.fixtures = fixtures
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _handler(self))
+        self._httpd.daemon_threads = True
+        self.base = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def start(self) -> "StubServer":
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def rewrite(self, url: str) -> str:
+        parts = urlsplit(url)
+        return f"{self.base}/{parts.netloc}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else "")
+
+    def _delay_and_fail(self) -> bool:
+        """Sleep for this request's latency; True if it should fail."""
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            fail = self._random.random() < self.failure_rate
+        if delay:
+            time.sleep(delay)
+        return fail
+
+    def read(self, name: str) -> bytes:
+        with open(os.path.join(self.fixtures, name), "rb") as f:
+            return f.read()
+
+    def route(self, host: str, path: str, body: bytes) -> tuple:
+        """(content type, body) for a request to the original host and path."""
+        if host == "api.telegram.org":
+            return "application/json", self.read("telegram.json")
+        if host == "api.openai.com":
+            payload = json.loads(body or b"{}")
+            completion = self.read("openai.json")
+            if payload.get("stream"):
+                return "text/event-stream", _as_events(json.loads(completion))
+            return "application/json", completion
+        if host == "newsapi.org":
+            return "application/json", self.read("newsapi.json")
+        if host == "bm.ge" and path.startswith("/category"):
+            return "text/html; charset=utf-8", self.read("bmge.html")
+        feed = os.path.join("feeds", fixture_name(host, path))
+        if os.path.exists(os.path.join(self.fixtures, feed)):
+            return "application/rss+xml", self.read(feed)
+        if re.search(r"(rss|feed|atom|\.xml)", path):
+            return "application/rss+xml", self.read(os.path.join("feeds", "default.xml"))
+        return "text/html; charset=utf-8", self.read("article.html")
+
+
+def _as_events(completion: dict) -> bytes:
+    """A chat completion replayed as streamed deltas, one line of content per event."""
+    content = completion["choices"][0]["message"]["content"]
+    events = []
+    for piece in re.split(r"(?<=\n)", content):
+        delta = {"choices": [{"index": 0, "delta": {"content": piece}}]}
+        events.append(f"data: {json.dumps(delta, ensure_ascii=False)}\n\n")
+    events.append("data: [DONE]\n\n")
+    return "".join(events).encode("utf-8")
+
+
+def _handler(server: StubServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _serve(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            if server._delay_and_fail():
+                self._reply(503, "text/plain", b"stub failure")
+                return
+            parts = urlsplit(self.path)
+            host, _, path = parts.path.lstrip("/").partition("/")
+            try:
+                content_type, payload = server.route(host, "/" + path, body)
+            except OSError:
+                self._reply(404, "text/plain", b"no fixture")
+                return
+            self._reply(200, content_type, payload)
+
+        def _reply(self, status: int, content_type: str, payload: bytes):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = _serve
+        do_POST = _serve
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
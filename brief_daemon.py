@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Resident mode for the morning brief.
+Runs a job at the DAEMON_SCHEDULE times and keeps the process, and with it the
+pooled HTTP session and in-memory caches, warm between runs. A Unix control
+socket accepts `run` (fire now) and `status` commands.
+"""
+
+import os
+import json
+import socket
+import threading
+import socketserver
+from datetime import datetime, timedelta
+
+from cache import CACHE_DIR
+
+DAEMON_SCHEDULE = os.getenv("DAEMON_SCHEDULE", "03:00")   # comma-separated local HH:MM
+DAEMON_SOCKET   = os.getenv("DAEMON_SOCKET", os.path.join(CACHE_DIR, "brief.sock"))
+
+
+def parse_schedule(spec: str) -> list:
+    times = []
+    for part in spec.split(","):
+        part = part.strip()
+        if part:
+            hour, minute = part.split(":")
+            times.append((int(hour), int(minute)))
+    return sorted(times)
+
+
+def next_run(schedule: list, now: datetime) -> datetime:
+    """The first scheduled time strictly after now."""
+    for day in (0, 1):
+        base = now + timedelta(days=day)
+        for hour, minute in schedule:
+            at = base.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if at > now:
+                return at
+    raise ValueError("empty daemon schedule")
+
+
+class _ControlHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        command = self.rfile.readline().decode("utf-8").strip()
+        state = self.server.state
+        if command == "run":
+            self.server.trigger.set()
+            reply = "ok: run queued"
+        elif command == "status":
+            reply = json.dumps(state, default=str)
+        else:
+            reply = f"error: unknown command {command!r}"
+        self.wfile.write((reply + "\n").encode("utf-8"))
+
+
+def serve(job, schedule: str = DAEMON_SCHEDULE, socket_path: str = DAEMON_SOCKET) -> None:
+    """Run job() at each scheduled time, or immediately when `run` arrives on the socket."""
+    times = parse_schedule(schedule)
+    os.makedirs(os.path.dirname(socket_path) or ".", exist_ok=True)
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    server = socketserver.ThreadingUnixStreamServer(socket_path, _ControlHandler)
+    server.trigger = threading.Event()
+    server.state = {"started": datetime.now(), "runs": 0, "last_run": None, "last_error": None}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"🛰️ Daemon up: schedule {schedule}, control socket {socket_path}")
+
+    try:
+        while True:
+            due = next_run(times, datetime.now())
+            server.state["next_run"] = due
+            server.trigger.wait(timeout=max(0.0, (due - datetime.now()).total_seconds()))
+            server.trigger.clear()
+            server.state["last_run"] = datetime.now()
+            try:
+                job()
+                server.state["last_error"] = None
+            except Exception as e:
+                print(f"ERROR: scheduled run failed: {e}")
+                server.state["last_error"] = str(e)
+            server.state["runs"] += 1
+    except KeyboardInterrupt:
+        print("Daemon stopping.")
+    finally:
+        server.shutdown()
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+def send_command(command: str, socket_path: str = DAEMON_SOCKET) -> str:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(5)
+        sock.connect(socket_path)
+        sock.sendall((command + "\n").encode("utf-8"))
+        return sock.makefile().readline().strip()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Combined daily run: fetch every upstream source once, render every brief.
+Variants: "ka" (bilingual AI brief, morning_briefing.py) and "en" (English
+briefing, english_daily_briefing.py). The RSS feeds, the BM.ge listing page and
+the NewsAPI topics are fetched concurrently, once, and shared in memory. The
+listing is only fetched up front for "en"; for "ka" alone it is a fallback,
+requested only if the Georgian sector comes back empty.
+
+Usage: python brief_pipeline.py [--variants ka,en]
+"""
+
+import os
+import time
+import argparse
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import article_text
+import morning_briefing as ka
+import english_daily_briefing as en
+from budget import Budget, DaemonPool
+from http_cache import get_text
+from seen_index import SeenIndex, SEEN_TTL_DAYS
+
+BRIEF_VARIANTS = os.getenv("BRIEF_VARIANTS", "ka,en")
+
+
+def _bmge_listing() -> str:
+    try:
+        return get_text(ka.BMGE_LISTING_URL, timeout=15)
+    except Exception as e:
+        print(f"  WARNING: BM.ge listing fetch failed: {e}")
+        return ""
+
+
+def fetch_sources(variants: list, seen: SeenIndex = None, budget: Budget = None) -> dict:
+    """Fetch each upstream source once, concurrently, for the requested variants."""
+    print("📡 Fetching shared sources...")
+    budget = budget or Budget(0)
+    partial = set()
+    deadline = budget.allot(ka.FETCH_DEADLINE, ka.SUMMARY_RESERVE)
+    end = time.monotonic() + deadline
+    pool = DaemonPool(3)
+    # get_all_news keeps to the deadline itself; the others are abandoned at it.
+    news = pool.submit(ka.get_all_news, deadline, seen, partial) if "ka" in variants else None
+    html = pool.submit(_bmge_listing) if "en" in variants else None
+    global_news = pool.submit(en.get_newsapi_news, 4, 1) if "en" in variants else None
+    sources = {
+        "news": news.result() if news else {},
+        "bmge_html": _until(html, end, "") if html else None,   # None: fetched on demand
+        "global_news": _until(global_news, end, ""),
+        "partial": partial,
+    }
+    pool.shutdown()
+    return sources
+
+
+def _until(future, end: float, default):
+    """The future's result if it arrives by `end` (a time.monotonic() value), else default."""
+    if future is None:
+        return default
+    try:
+        return future.result(timeout=max(0.0, end - time.monotonic()))
+    except FutureTimeout:
+        print("  WARNING: a shared source missed the fetch deadline")
+        return default
+
+
+def run_georgian(sources: dict, seen: SeenIndex = None, budget: Budget = None) -> bool:
+    budget = budget or Budget(0)
+    all_news = ka.fill_bmge_fallback(sources["news"], seen, html=sources["bmge_html"],
+                                     timeout=budget.allot(12, ka.SUMMARY_RESERVE))
+    all_news = ka.enrich_news(all_news, budget.allot(article_text.ENRICH_DEADLINE, ka.SUMMARY_RESERVE))
+    print("\n🤖 Summarizing with OpenAI...")
+    digest = ka.summarize_with_openai(all_news, timeout=budget.allot(ka.SUMMARY_DEADLINE, ka.DELIVERY_RESERVE))
+    message = ka.build_message(digest, ka.todays_tasks(), sources["partial"])
+    return ka.deliver(message, all_news, seen, deadline=budget.deadline)
+
+
+def run_english(sources: dict, budget: Budget = None) -> bool:
+    bm_news = en.get_bmge_top_news(3, html=sources["bmge_html"])
+    message = en.create_english_message(bm_news, sources["global_news"])
+
+    print("\n" + "=" * 60)
+    print(message)
+    print("=" * 60 + "\n")
+
+    if en.TELEGRAM_BOT_TOKEN == "YOUR_BOT_TOKEN_HERE":
+        print("⚠️ Set TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID as secrets/env vars.")
+        return False
+    return en.send_telegram_message(message, budget.deadline if budget else None)
+
+
+def run_all(variants: list) -> dict:
+    print(f"🌅 Combined brief run: {', '.join(variants)}\n")
+    seen = SeenIndex() if SEEN_TTL_DAYS > 0 and "ka" in variants else None
+    budget = Budget()
+    results = {}
+    if "ka" in variants and ka.flush_outbox(seen, budget.deadline):
+        results["ka"] = True   # an undelivered brief was resumed instead of building a new one
+        variants = [v for v in variants if v != "ka"]
+    sources = fetch_sources(variants, seen, budget) if variants else {}
+
+    if "ka" in variants:
+        results["ka"] = run_georgian(sources, seen, budget)
+    if "en" in variants:
+        results["en"] = run_english(sources, budget)
+    print(f"⏱️ Run took {budget.elapsed():.1f}s")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render every brief variant from one fetch")
+    parser.add_argument("--variants", default=BRIEF_VARIANTS,
+                        help="comma-separated variants to render (ka, en)")
+    args = parser.parse_args()
+    variants = [v.strip() for v in args.variants.split(",") if v.strip()]
+    ka.reported(lambda: run_all(variants), "pipeline")()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Broadcast mode: deliver one rendered brief to many Telegram chats.
+The message is split once, then fanned out with asyncio over a pool of
+BROADCAST_CONCURRENCY threads (the blocking sends would otherwise share the
+loop's small default executor); the shared telegram_delivery buckets keep the
+whole fan-out under Telegram's ~30 msg/s.
+Recipients are configured in recipients.py.
+"""
+
+import os
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import telegram_delivery
+
+BROADCAST_CONCURRENCY = int(os.getenv("BROADCAST_CONCURRENCY", "16"))
+
+
+def _send_chunks(token: str, chat_id: str, chunks: list) -> tuple:
+    for chunk in chunks:
+        r = telegram_delivery.send_chunk(token, chat_id, chunk)
+        if r is None or r.status_code != 200:
+            return False, f"{getattr(r, 'status_code', '?')} {getattr(r, 'text', '')[:120]}"
+    return True, ""
+
+
+async def _deliver(token: str, chat_id: str, chunks: list, pool: ThreadPoolExecutor) -> dict:
+    started = time.monotonic()
+    try:
+        ok, error = await asyncio.get_running_loop().run_in_executor(pool, _send_chunks, token, chat_id, chunks)
+    except Exception as e:
+        ok, error = False, str(e)
+    return {"chat_id": chat_id, "ok": ok, "error": error, "seconds": time.monotonic() - started}
+
+
+async def broadcast_async(token: str, message: str, recipients: list,
+                          concurrency: int = BROADCAST_CONCURRENCY) -> list:
+    chunks = telegram_delivery.split_message(message)
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="broadcast") as pool:
+        return await asyncio.gather(*(_deliver(token, chat_id, chunks, pool) for chat_id in recipients))
+
+
+def broadcast(token: str, message: str, recipients: list) -> list:
+    """Send message to every recipient and print a per-recipient delivery report."""
+    if not token or not recipients:
+        return []
+    print(f"📣 Broadcasting to {len(recipients)} recipient(s)...")
+    started = time.monotonic()
+    results = asyncio.run(broadcast_async(token, message, recipients))
+    elapsed = time.monotonic() - started
+
+    chunks = len(telegram_delivery.split_message(message))
+    delivered = [r for r in results if r["ok"]]
+    for r in results:
+        status = "OK  " if r["ok"] else "FAIL"
+        print(f"  {status} {r['chat_id']} ({r['seconds']:.2f}s) {r['error']}".rstrip())
+    rate = len(delivered) * chunks / elapsed if elapsed else 0.0
+    print(f"  Delivered {len(delivered)}/{len(results)} in {elapsed:.1f}s ({rate:.1f} msg/s)")
+    return results
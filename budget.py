@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+End-to-end time budget for a run.
+Each stage asks for its own limit and gets at most that, and never more than is
+left after reserving time for the stages after it, so the whole run finishes
+within RUN_BUDGET seconds of its start however slow the upstreams are.
+Work a stage stops waiting for runs on DaemonPool threads, so it is abandoned
+rather than joined when the process exits.
+"""
+
+import os
+import time
+import queue
+import threading
+from concurrent.futures import Future
+
+RUN_BUDGET = float(os.getenv("RUN_BUDGET", "45"))   # seconds from start to delivery; 0 disables
+
+
+class Budget:
+    def __init__(self, seconds: float = RUN_BUDGET):
+        self.started = time.monotonic()
+        self.deadline = self.started + seconds if seconds > 0 else None
+
+    def remaining(self) -> float:
+        if self.deadline is None:
+            return float("inf")
+        return max(0.0, self.deadline - time.monotonic())
+
+    def allot(self, limit: float, reserve: float = 0.0) -> float:
+        """Seconds the next stage may take: at most limit, leaving reserve for later stages."""
+        return max(0.0, min(limit, self.remaining() - reserve))
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+
+class DaemonPool:
+    """
+    A minimal executor whose workers are daemon threads. ThreadPoolExecutor
+    workers are joined at interpreter exit, so a request a stage gave up on
+    would still hold the process until its own timeout; these are not.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._queue = queue.SimpleQueue()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        self._queue.put((future, fn, args))
+        with self._lock:
+            if len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._work, daemon=True)
+                self._threads.append(thread)
+                thread.start()
+        return future
+
+    def _work(self) -> None:
+        while True:
+            task = self._queue.get()
+            if task is None:
+                return
+            future, fn, args = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def shutdown(self) -> None:
+        """Cancel queued work and let the workers exit; running calls are abandoned, not awaited."""
+        while True:
+            try:
+                task = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if task is not None:
+                task[0].cancel()
+        with self._lock:
+            for _ in self._threads:
+                self._queue.put(None)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tiny on-disk JSON cache shared by the briefing scripts.
+One file per entry under CACHE_DIR/<namespace>/, with a TTL and a size bound.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+
+CACHE_DIR = os.getenv(
+    "BRIEF_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"),
+)
+
+
+class JsonCache:
+    """
+    Key/value store of JSON-serializable values, evicting expired and oldest entries.
+    Entries are also kept in memory, so a long-running process (--daemon) reads
+    them back without touching the disk.
+    """
+
+    def __init__(self, namespace: str, ttl: float, max_entries: int = 500):
+        self.dir = os.path.join(CACHE_DIR, namespace)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._memory = {}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, key: str, max_age: float = None):
+        """Return the cached value, or None if missing or older than max_age (default: ttl)."""
+        max_age = self.ttl if max_age is None else max_age
+        entry = self._memory.get(key)
+        if entry is None:
+            try:
+                with open(self._path(key), encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                return None
+            if entry.get("key") != key:
+                return None
+            self._remember(key, entry)
+        if time.time() - entry.get("stored_at", 0) > max_age:
+            return None
+        return entry.get("value")
+
+    def _remember(self, key: str, entry: dict) -> None:
+        with self._lock:
+            self._memory.pop(key, None)
+            self._memory[key] = entry
+            while len(self._memory) > self.max_entries:
+                self._memory.pop(next(iter(self._memory)))
+
+    def set(self, key: str, value) -> None:
+        entry = {"key": key, "stored_at": time.time(), "value": value}
+        self._remember(key, entry)
+        path = self._path(key)
+        try:
+            os.makedirs(self.dir, exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"  WARNING: cache write failed for {self.dir}: {e}")
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """Drop expired entries, then the oldest ones until at most max_entries remain."""
+        with self._lock:
+            try:
+                names = [n for n in os.listdir(self.dir) if n.endswith(".json")]
+            except OSError:
+                return
+            now = time.time()
+            entries = []
+            for name in names:
+                path = os.path.join(self.dir, name)
+                try:
+                    mtime = os.path.getmtime(path)
+                except OSError:
+                    continue
+                if now - mtime > self.ttl:
+                    _remove(path)
+                else:
+                    entries.append((mtime, path))
+            entries.sort()
+            for _, path in entries[:max(0, len(entries) - self.max_entries)]:
+                _remove(path)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
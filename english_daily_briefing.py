@@ -12,9 +12,11 @@ Designed to run as a *secondary* file alongside your existing briefing script.
 """
 
 import os
-import requests
 from datetime import datetime
-from bs4 import BeautifulSoup
+
+import newsapi_client
+import telegram_delivery
+from http_cache import get_text
 
 # === Configuration (via GitHub Secrets / env vars) ===
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "YOUR_BOT_TOKEN_HERE")
@@ -204,32 +206,38 @@ def _safe_md(text: str) -> str:
                 .replace('`', ' ')
                 .strip())
 
-def get_bmge_top_news(max_items: int = 3) -> str:
-    url = "https://bm.ge/category/all"
-    headers = {"User-Agent": "Mozilla/5.0 (MorningBriefBot)"}
-    try:
-        r = requests.get(url, headers=headers, timeout=15)
-        r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
+def _parse_bmge_links(html: str, max_items: int) -> list:
+    from bs4 import BeautifulSoup   # only needed when the listing is parsed
+    soup = BeautifulSoup(html, "html.parser")
 
-        items = []
-        seen = set()
+    items = []
+    seen = set()
+
+    for a in soup.select('a[href^="/news/"]'):
+        href = (a.get("href") or "").strip()
+        title = _safe_md(a.get_text(" ", strip=True))
+
+        if not href or not title or len(title) < 10:
+            continue
 
-        for a in soup.select('a[href^="/news/"]'):
-            href = (a.get("href") or "").strip()
-            title = _safe_md(a.get_text(" ", strip=True))
+        full_url = "https://bm.ge" + href
+        if full_url.lower() in seen:
+            continue
+        seen.add(full_url.lower())
 
-            if not href or not title or len(title) < 10:
-                continue
+        items.append((title, full_url))
+        if len(items) >= max_items:
+            break
 
-            full_url = "https://bm.ge" + href
-            if full_url.lower() in seen:
-                continue
-            seen.add(full_url.lower())
+    return items
 
-            items.append((title, full_url))
-            if len(items) >= max_items:
-                break
+def get_bmge_top_news(max_items: int = 3, html: str = None) -> str:
+    url = "https://bm.ge/category/all"
+    headers = {"User-Agent": "Mozilla/5.0 (MorningBriefBot)"}
+    try:
+        if html is None:
+            html = get_text(url, headers=headers, timeout=15)
+        items = _parse_bmge_links(html, max_items)
 
         if not items:
             return "📰 *BM.ge Top News:*\n_No BM.ge news available right now._"
@@ -249,52 +257,31 @@ def get_newsapi_news(max_topics: int = 4, max_articles_per_topic: int = 1) -> st
     if NEWS_API_KEY == "YOUR_NEWS_API_KEY_HERE" or not NEWS_API_KEY:
         return ""  # silent if not configured
 
-    topic_keywords = {
-        "crypto": "cryptocurrency OR bitcoin OR ethereum",
-        "ai": "artificial intelligence OR AI OR machine learning",
-        "space": "astronomy OR space OR NASA OR SpaceX",
-        "tech": "technology OR startup OR innovation",
-        "stocks": "stock market OR trading OR nasdaq",
-        "ecommerce": "e-commerce OR online shopping OR retail",
-    }
+    results = newsapi_client.fetch_topics(NEWS_API_KEY, page_size=max_articles_per_topic,
+                                          want=max_topics, timeout=12)
 
     lines = ["🗞️ *Global Headlines (NewsAPI):*", ""]
     added = 0
 
-    for topic, q in topic_keywords.items():
+    for topic, arts in results.items():
         if added >= max_topics:
             break
-        try:
-            url = "https://newsapi.org/v2/everything"
-            params = {
-                "q": q,
-                "language": "en",
-                "sortBy": "publishedAt",
-                "pageSize": max_articles_per_topic,
-                "apiKey": NEWS_API_KEY,
-            }
-            resp = requests.get(url, params=params, timeout=12)
-            if resp.status_code != 200:
-                continue
-            data = resp.json()
-            arts = data.get("articles", [])
-            if not arts:
-                continue
-            a = arts[0]
-            title = _safe_md(a.get("title", "No title"))
-            link = a.get("url", "")
-            lines.append(f"*{topic.upper()}:*")
-            lines.append(f"• [{title}]({link})")
-            lines.append("")
-            added += 1
-        except Exception:
+        if not arts:
             continue
+        a = arts[0]
+        title = _safe_md(a.get("title", "No title"))
+        link = a.get("url", "")
+        lines.append(f"*{topic.upper()}:*")
+        lines.append(f"• [{title}]({link})")
+        lines.append("")
+        added += 1
 
     if added == 0:
         return ""
     return "\n".join(lines).strip()
 
-def create_english_message() -> str:
+def create_english_message(bm_news: str = None, global_news: str = None) -> str:
+    """Render the English brief; pre-fetched news sections can be passed in."""
     i = _idx_30()
     now = datetime.now()
 
@@ -304,8 +291,11 @@ def create_english_message() -> str:
     astro_tips = ASTROMAN_TIPS_30[i]
     tasks = TASKS_30[i]
 
-    bm_news = get_bmge_top_news(3)
-    global_news = get_newsapi_news(max_topics=4, max_articles_per_topic=1)
+    if bm_news is None:
+        bm_news = get_bmge_top_news(3)
+    if global_news is None:
+        global_news = get_newsapi_news(max_topics=4, max_articles_per_topic=1)
+    global_block = ("\n\n" + global_news) if global_news else ""
 
     message = f"""
 ☀️ *Good Morning, Rezi!*
@@ -346,7 +336,7 @@ def create_english_message() -> str:
 ━━━━━━━━━━━━━━━━━━━━
 
 {bm_news}
-{("\n\n" + global_news) if global_news else ""}
+{global_block}
 
 ━━━━━━━━━━━━━━━━━━━━
 
@@ -355,25 +345,12 @@ def create_english_message() -> str:
 
     return message
 
-def send_telegram_message(message: str) -> bool:
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-    payload = {
-        "chat_id": TELEGRAM_CHAT_ID,
-        "text": message,
-        "parse_mode": "Markdown",
-        "disable_web_page_preview": True,
-    }
-
-    try:
-        resp = requests.post(url, json=payload, timeout=15)
-        if resp.status_code == 200:
-            print(f"✅ English brief sent at {datetime.now()}")
-            return True
-        print(f"❌ Telegram send failed: {resp.status_code} | {resp.text}")
-        return False
-    except Exception as e:
-        print(f"❌ Telegram error: {e}")
-        return False
+def send_telegram_message(message: str, deadline: float = None) -> bool:
+    if telegram_delivery.send_message(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, message, deadline=deadline):
+        print(f"✅ English brief sent at {datetime.now()}")
+        return True
+    print("❌ Telegram send failed")
+    return False
 
 def main():
     print("☀️ Generating English daily briefing...")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Local extractive summaries, used when OpenAI is unavailable or too slow.
+Sentences from a sector's titles, feed summaries and article bodies become
+hashed TF-IDF vectors (ranking.vectors); the ones closest to the sector's
+centroid are kept, one per article and skipping near-repeats of one already
+chosen, and listed in article order with a link to their source. Without
+NumPy the first titles are used instead. No network, and a few milliseconds
+per sector.
+"""
+
+import re
+from urllib.parse import urlsplit
+
+import ranking
+
+SENTENCES_PER_SECTOR = 3
+REDUNDANCY           = 0.6   # cosine above which a sentence repeats one already chosen
+MIN_SENTENCE         = 25
+MAX_SENTENCE         = 300
+
+_TERMINATORS = (".", "!", "?", "…")
+_CLOSERS     = "\"'”»)]"
+_SENTENCE_RE = re.compile(r"(?<=[.!?…])\s+")
+_TAG_RE      = re.compile(r"<[^>]+>")
+
+
+def sentences(articles: list) -> list:
+    """(article index, sentence) pairs: each title, then the sentences of its summary/body."""
+    result, seen = [], set()
+    for i, a in enumerate(articles):
+        text = _TAG_RE.sub(" ", a.get("body") or a.get("summary") or "")
+        pieces = _SENTENCE_RE.split(" ".join(text.split()))
+        # Feed summaries are cut at 200 characters; an unterminated tail is dropped.
+        pieces = [p for p in pieces if p.rstrip(_CLOSERS).endswith(_TERMINATORS)]
+        for sentence in [a.get("title", "")] + pieces:
+            sentence = sentence.strip()
+            key = sentence.casefold()
+            if MIN_SENTENCE <= len(sentence) <= MAX_SENTENCE and key not in seen:
+                seen.add(key)
+                result.append((i, sentence))
+    return result
+
+
+def pick(candidates: list, k: int = SENTENCES_PER_SECTOR) -> list:
+    """
+    Indices into `candidates` of the k most central sentences, in order: at most
+    one per article, and none repeating one already chosen.
+    """
+    if not ranking.available():
+        firsts = {}
+        for idx, (article, _) in enumerate(candidates):
+            firsts.setdefault(article, idx)
+        return list(firsts.values())[:k]
+
+    np = ranking.np
+    x = ranking.vectors([text for _, text in candidates])
+    centroid = x.mean(axis=0)
+    scores = x @ (centroid / (np.linalg.norm(centroid) or 1.0))
+    chosen, articles = [], set()
+    for idx in np.argsort(-scores, kind="stable"):
+        article = candidates[idx][0]
+        if article not in articles and all(x[idx] @ x[j] < REDUNDANCY for j in chosen):
+            chosen.append(int(idx))
+            articles.add(article)
+        if len(chosen) == k:
+            break
+    return sorted(chosen)
+
+
+def summarize_sector(sector: str, articles: list, k: int = SENTENCES_PER_SECTOR) -> str:
+    """A "*sector*" block of k extracted sentences, or "" when there is nothing to extract."""
+    candidates = sentences(articles)
+    if not candidates:
+        return ""
+    lines = [f"*{sector}*"]
+    for idx in pick(candidates, k):
+        article, text = candidates[idx]
+        link = articles[article].get("link", "")
+        host = urlsplit(link).netloc.lower().removeprefix("www.")
+        lines.append(f"• {text} ([{host}]({link}))" if host else f"• {text}")
+    return "\n".join(lines)
+
+
+def summarize(all_news: dict) -> dict:
+    """{sector: block} for every sector with something to extract."""
+    blocks = {sector: summarize_sector(sector, articles) for sector, articles in all_news.items()}
+    return {sector: block for sector, block in blocks.items() if block}
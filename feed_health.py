@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Per-feed health state, persisted across runs.
+Tracks success rate, latency percentiles and consecutive failures per endpoint
+(a URL plus its query, see http_cache.health_key). A feed that keeps failing trips
+a circuit breaker and is only probed every BREAKER_PROBE_INTERVAL seconds;
+healthy feeds get a timeout fitted to their p95. Only the first failure of an
+endpoint in a run counts, so hedged or repeated requests within one run do not
+trip the breaker sooner than BREAKER_FAILURES runs.
+"""
+
+import os
+import json
+import time
+import threading
+
+from cache import CACHE_DIR
+
+HEALTH_FILE            = os.getenv("HEALTH_FILE", os.path.join(CACHE_DIR, "feed_health.json"))
+BREAKER_FAILURES       = int(os.getenv("BREAKER_FAILURES", "3"))
+BREAKER_PROBE_INTERVAL = float(os.getenv("BREAKER_PROBE_INTERVAL", str(6 * 3600)))
+HEALTH_SAMPLES         = 50
+MIN_TIMEOUT            = 3.0
+
+
+class FeedUnavailable(Exception):
+    """Raised instead of requesting a feed whose circuit breaker is open."""
+
+
+def _percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class FeedHealth:
+    def __init__(self, path: str = HEALTH_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._failed_this_run = set()
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.state = json.load(f)
+        except (OSError, ValueError):
+            self.state = {}
+
+    def begin_run(self) -> None:
+        """Start counting failures for a new run (a --daemon process makes many)."""
+        with self._lock:
+            self._failed_this_run.clear()
+
+    def allow(self, url: str) -> bool:
+        """False while the breaker is open; one probe is let through per interval."""
+        st = self.state.get(url)
+        if not st or st["consecutive_failures"] < BREAKER_FAILURES:
+            return True
+        return time.time() - st["last_attempt"] >= BREAKER_PROBE_INTERVAL
+
+    def timeout_for(self, url: str, default: float) -> float:
+        """Twice the observed p95 latency, clamped to [MIN_TIMEOUT, default]."""
+        latencies = self.state.get(url, {}).get("latencies", [])
+        if len(latencies) < 5:
+            return default
+        return min(default, max(MIN_TIMEOUT, 2 * _percentile(latencies, 95)))
+
+    def record(self, url: str, ok: bool, latency: float) -> None:
+        with self._lock:
+            st = self.state.setdefault(url, {
+                "successes": 0, "failures": 0, "consecutive_failures": 0,
+                "latencies": [], "last_attempt": 0,
+            })
+            st["last_attempt"] = time.time()
+            if ok:
+                st["successes"] += 1
+                st["consecutive_failures"] = 0
+                st["latencies"] = (st["latencies"] + [round(latency, 3)])[-HEALTH_SAMPLES:]
+            elif url in self._failed_this_run:
+                return
+            else:
+                self._failed_this_run.add(url)
+                st["failures"] += 1
+                st["consecutive_failures"] += 1
+                if st["consecutive_failures"] == BREAKER_FAILURES:
+                    print(f"  WARNING: circuit opened for {url} after {BREAKER_FAILURES} failures")
+            self._save()
+
+    def stats(self, url: str) -> dict:
+        st = self.state.get(url)
+        if not st:
+            return {}
+        total = st["successes"] + st["failures"]
+        latencies = st["latencies"]
+        return {
+            "success_rate": st["successes"] / total if total else 0.0,
+            "p50": _percentile(latencies, 50) if latencies else None,
+            "p95": _percentile(latencies, 95) if latencies else None,
+            "consecutive_failures": st["consecutive_failures"],
+        }
+
+    def _save(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(self.state, f)
+            os.replace(self.path + ".tmp", self.path)
+        except OSError as e:
+            print(f"  WARNING: cannot save feed health: {e}")
+
+
+HEALTH = FeedHealth()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Feed registry and polling scheduler.
+Feeds are listed in FEEDS_FILE (sector, url, priority, interval, max_items).
+Each run polls only the feeds that are due: a feed is due once its interval has
+passed since the last successful poll, and a feed whose items keep coming back
+unchanged has its interval stretched up to MAX_BACKOFF times. Feeds that are not
+due are served from the items stored at their last poll.
+"""
+
+import os
+import json
+import time
+import threading
+
+from cache import CACHE_DIR, JsonCache
+from seen_index import normalize_link
+
+FEEDS_FILE       = os.getenv("FEEDS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "feeds.json"))
+SCHEDULE_FILE    = os.getenv("SCHEDULE_FILE", os.path.join(CACHE_DIR, "feed_schedule.json"))
+FEEDS_PER_RUN    = int(os.getenv("FEEDS_PER_RUN", "0"))   # 0: poll every due feed
+FEED_ITEMS_TTL   = float(os.getenv("FEED_ITEMS_TTL", str(14 * 24 * 3600)))
+DEFAULT_PRIORITY = 1      # higher is polled (and read) first
+DEFAULT_INTERVAL = 3600   # seconds between polls
+MAX_BACKOFF      = 4      # an unchanged feed waits at most this many intervals
+SCHEDULE_SLACK   = 0.1    # a feed is due this fraction of its interval early, so hourly runs don't drift past it
+
+
+def load_feeds(path: str = FEEDS_FILE, max_items: int = 15) -> list:
+    """Feed dicts in file order; missing fields come from "defaults", then the module defaults."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"  WARNING: cannot load feed registry {path}: {e}")
+        return []
+
+    defaults = {"priority": DEFAULT_PRIORITY, "interval": DEFAULT_INTERVAL, "max_items": max_items}
+    defaults.update(config.get("defaults", {}))
+    feeds = []
+    for entry in config.get("feeds", []):
+        if not entry.get("url") or not entry.get("sector"):
+            print(f"  WARNING: skipping feed registry entry without url/sector: {entry}")
+            continue
+        feeds.append({**defaults, **entry})
+    return feeds
+
+
+def by_sector(feeds: list) -> dict:
+    """{sector: [feeds]} in order of first appearance, each sector's feeds by priority."""
+    sectors = {}
+    for feed in feeds:
+        sectors.setdefault(feed["sector"], []).append(feed)
+    return {sector: sorted(group, key=lambda f: -f["priority"]) for sector, group in sectors.items()}
+
+
+class FeedScheduler:
+    """Decides which feeds to poll this run and remembers what each one returned."""
+
+    def __init__(self, feeds: list, path: str = SCHEDULE_FILE):
+        self.feeds = feeds
+        self.path = path
+        self._lock = threading.Lock()
+        self._items = JsonCache("feed-items", ttl=FEED_ITEMS_TTL, max_entries=max(500, 2 * len(feeds)))
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.state = json.load(f)
+        except (OSError, ValueError):
+            self.state = {}
+
+    def interval(self, feed: dict) -> float:
+        return feed["interval"] * self.state.get(feed["url"], {}).get("backoff", 1)
+
+    def due(self, now: float = None) -> list:
+        """
+        Feeds to poll now, most important first: by priority, then by how far
+        past their interval they are. At most FEEDS_PER_RUN when that is set.
+        """
+        now = time.time() if now is None else now
+        ranked = []
+        for feed in {f["url"]: f for f in self.feeds}.values():
+            last = self.state.get(feed["url"], {}).get("polled_at")
+            if last is None or self.stored(feed) is None:
+                overdue = float("inf")
+            else:
+                overdue = (now - last) / self.interval(feed)
+            if overdue >= 1 - SCHEDULE_SLACK:
+                ranked.append((-feed["priority"], -overdue, feed))
+        ranked.sort(key=lambda r: r[:2])
+        due = [feed for _, _, feed in ranked]
+        return due[:FEEDS_PER_RUN] if FEEDS_PER_RUN > 0 else due
+
+    def stored(self, feed: dict):
+        """Items from the feed's last successful poll, or None."""
+        return self._items.get(feed["url"])
+
+    def record(self, feed: dict, items: list, now: float = None) -> None:
+        """Store a poll's items; an empty result is treated as a failed poll and retried next run."""
+        if not items:
+            return
+        url = feed["url"]
+        previous = {normalize_link(a.get("link", "")) for a in self.stored(feed) or []}
+        changed = any(normalize_link(a.get("link", "")) not in previous for a in items)
+        with self._lock:
+            st = self.state.setdefault(url, {"backoff": 1})
+            st["polled_at"] = time.time() if now is None else now
+            st["backoff"] = 1 if changed else min(MAX_BACKOFF, st["backoff"] * 2)
+        self._items.set(url, items)
+
+    def save(self) -> None:
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+                    json.dump(self.state, f)
+                os.replace(self.path + ".tmp", self.path)
+            except OSError as e:
+                print(f"  WARNING: cannot save feed schedule: {e}")
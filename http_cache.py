@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Conditional-GET response cache.
+Stores ETag/Last-Modified validators next to the *parsed* result of a URL, so an
+unchanged feed costs one 304 round-trip and no parsing, and a rerun within
+HTTP_CACHE_FRESH seconds costs nothing at all.
+"""
+
+import os
+import time
+from urllib.parse import urlencode
+
+import http_client
+import metrics
+from cache import JsonCache
+from feed_health import HEALTH, FeedUnavailable
+
+HTTP_CACHE_TTL         = float(os.getenv("HTTP_CACHE_TTL", str(3 * 24 * 3600)))
+HTTP_CACHE_FRESH       = float(os.getenv("HTTP_CACHE_FRESH", "600"))
+HTTP_CACHE_MAX_ENTRIES = int(os.getenv("HTTP_CACHE_MAX_ENTRIES", "500"))
+
+_CACHE = JsonCache("http", ttl=HTTP_CACHE_TTL, max_entries=HTTP_CACHE_MAX_ENTRIES)
+
+
+def cache_key(url: str, params: dict = None, kind: str = "") -> str:
+    # Credentials never end up in the cache files.
+    query = urlencode(sorted((k, v) for k, v in (params or {}).items() if k.lower() != "apikey"))
+    return f"{kind} {url}?{query}"
+
+
+def health_key(url: str, params: dict = None) -> str:
+    """feed_health's key for a request: the URL, plus its query when it has parameters."""
+    return cache_key(url, params).strip().rstrip("?")
+
+
+def peek(url: str, *, kind: str, params: dict = None):
+    """The cached result for a request, however stale (up to HTTP_CACHE_TTL), or None."""
+    entry = _CACHE.get(cache_key(url, params, kind))
+    return entry["items"] if entry else None
+
+
+def get_cached(url: str, parse, *, kind: str, params: dict = None, headers: dict = None,
+               timeout: float = 12, stream: bool = False, fresh_for: float = None):
+    """
+    GET url and return parse(response), revalidating a cached result when possible.
+    `kind` namespaces the entry, since the same URL may be parsed in different ways.
+    Errors (HTTP or parse) propagate to the caller; empty results are not cached.
+    Each attempt is recorded in feed_health under health_key(url, params): the
+    timeout adapts to that endpoint's p95, and while its breaker is open the stale
+    entry (or FeedUnavailable) is returned.
+    A result younger than fresh_for (default HTTP_CACHE_FRESH) is served without a request.
+    Every call is timed as a "fetch:<kind>" span (and "parse:<kind>" when parsed).
+    """
+    key = cache_key(url, params, kind)
+    health = health_key(url, params)
+    with metrics.span(f"fetch:{kind.split(':')[0]}", url=url) as span:
+        fresh = _CACHE.get(key, max_age=HTTP_CACHE_FRESH if fresh_for is None else fresh_for)
+        if fresh is not None:
+            span.update(status="fresh", items=len(fresh["items"]))
+            return fresh["items"]
+
+        entry = _CACHE.get(key)
+        if not HEALTH.allow(health):
+            span["status"] = "breaker"
+            if entry:
+                return entry["items"]
+            raise FeedUnavailable(f"circuit open for {url}")
+
+        req_headers = dict(headers or {})
+        if entry:
+            if entry.get("etag"):
+                req_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                req_headers["If-Modified-Since"] = entry["last_modified"]
+
+        started = time.monotonic()
+        try:
+            r = http_client.get(url, params=params, headers=req_headers,
+                                timeout=HEALTH.timeout_for(health, timeout), stream=stream)
+            try:
+                span.update(http=r.status_code, retries=_retries(r))
+                if r.status_code == 304 and entry:
+                    _CACHE.set(key, entry)
+                    HEALTH.record(health, True, time.monotonic() - started)
+                    span.update(status="revalidated", items=len(entry["items"]))
+                    return entry["items"]
+                r.raise_for_status()
+                with metrics.span(f"parse:{kind.split(':')[0]}", url=url) as parsed:
+                    items = parse(r)
+                    parsed["items"] = len(items)
+                span["bytes"] = _bytes_read(r)
+            finally:
+                r.close()
+        except Exception:
+            HEALTH.record(health, False, time.monotonic() - started)
+            raise
+        HEALTH.record(health, True, time.monotonic() - started)
+        span["items"] = len(items)
+
+    if items:
+        _CACHE.set(key, {
+            "etag": r.headers.get("ETag", ""),
+            "last_modified": r.headers.get("Last-Modified", ""),
+            "items": items,
+        })
+    return items
+
+
+def _retries(r) -> int:
+    """Retries urllib3 made before this response."""
+    retries = getattr(r.raw, "retries", None)
+    return len(retries.history) if retries is not None else 0
+
+
+def _bytes_read(r) -> int:
+    """Bytes received on the wire (before decompression), as far as the body was read."""
+    try:
+        return r.raw.tell()
+    except Exception:
+        return 0
+
+
+def get_text(url: str, headers: dict = None, timeout: float = 12) -> str:
+    """The decoded body of a page, cached under one key for every consumer of that page."""
+    return get_cached(url, lambda r: r.text, kind="text", headers=headers, timeout=timeout)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for every outbound call (feeds, BM.ge, NewsAPI, OpenAI, Telegram).
+One keep-alive session per process, so the TCP+TLS handshake is paid once per host.
+"""
+
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+HTTP_POOL_HOSTS      = int(os.getenv("HTTP_POOL_HOSTS", "32"))     # host pools kept alive
+HTTP_POOL_PER_HOST   = int(os.getenv("HTTP_POOL_PER_HOST", "8"))   # concurrent connections per host
+HTTP_RETRIES         = int(os.getenv("HTTP_RETRIES", "2"))
+HTTP_BACKOFF         = float(os.getenv("HTTP_BACKOFF", "0.5"))
+HTTP_MAX_RETRY_AFTER = float(os.getenv("HTTP_MAX_RETRY_AFTER", "2"))   # cap on a server's Retry-After
+
+USER_AGENT = "MorningBriefBot/2.0"
+
+_session = None
+_lock = threading.Lock()
+_rewrite = None
+
+
+def _accept_encoding() -> str:
+    # urllib3 only decodes brotli when one of these packages is installed.
+    for module in ("brotli", "brotlicffi"):
+        try:
+            __import__(module)
+            return "gzip, deflate, br"
+        except ImportError:
+            continue
+    return "gzip, deflate"
+
+
+class CappedRetry(Retry):
+    """
+    Retry that sleeps at most HTTP_MAX_RETRY_AFTER seconds, whatever Retry-After
+    asks for (the sleep is not covered by the request timeout). 429s are never
+    retried here: callers such as newsapi_client need to see them at once to
+    fall back to cached results.
+    """
+
+    RETRY_AFTER_STATUS_CODES = frozenset({503})
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, HTTP_MAX_RETRY_AFTER)
+
+
+def build_adapter(cls=HTTPAdapter, **kwargs) -> HTTPAdapter:
+    """An adapter (of `cls`) with the shared pool limits and retry policy."""
+    # Status and read-error retries apply to idempotent methods only; POSTs
+    # (OpenAI, Telegram) are retried solely when the connection never opened.
+    retry = CappedRetry(
+        total=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF,
+        backoff_max=HTTP_MAX_RETRY_AFTER,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    return cls(
+        pool_connections=HTTP_POOL_HOSTS,
+        pool_maxsize=HTTP_POOL_PER_HOST,
+        pool_block=True,
+        max_retries=retry,
+        **kwargs,
+    )
+
+
+def _build_session() -> requests.Session:
+    adapter = build_adapter()
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept-Encoding": _accept_encoding(),
+    })
+    return session
+
+
+def mount(adapter: HTTPAdapter) -> None:
+    """Send every request of the shared session through `adapter` (see replay.py)."""
+    session = get_session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+
+def get_session() -> requests.Session:
+    global _session
+    with _lock:
+        if _session is None:
+            _session = _build_session()
+        return _session
+
+
+def set_url_rewrite(rewrite) -> None:
+    """
+    Route every request through rewrite(url) -> url, or directly again with None.
+    The benchmark suite uses this to point all upstreams at its local stub server;
+    callers keep seeing (and caching by) the original URLs.
+    """
+    global _rewrite
+    _rewrite = rewrite
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return get_session().get(_rewrite(url) if _rewrite else url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return get_session().post(_rewrite(url) if _rewrite else url, **kwargs)
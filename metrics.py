@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Per-stage timing for a run.
+Code under measurement wraps itself in `with metrics.span("name", key=value) as s:`
+and may add attributes to `s` (bytes, items, status, retries...). A span that
+raises is recorded with status "error". At the end of a run, write_report()
+saves every span to a JSON report under METRICS_DIR, optionally refreshes a
+Prometheus textfile (for node_exporter's textfile collector), and prints the
+slowest stages.
+"""
+
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+from cache import CACHE_DIR
+
+METRICS_DIR         = os.getenv("METRICS_DIR", os.path.join(CACHE_DIR, "metrics"))
+METRICS_KEEP        = int(os.getenv("METRICS_KEEP", "30"))   # run reports kept on disk
+PROMETHEUS_TEXTFILE = os.getenv("PROMETHEUS_TEXTFILE", "")   # e.g. /var/lib/node_exporter/brief.prom
+MAX_SPANS           = 10_000
+
+_spans = []
+_lock = threading.Lock()
+_started = time.time()
+_started_mono = time.monotonic()
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Time the block as stage `name`; the yielded dict holds its attributes."""
+    attrs = dict(attrs)
+    started = time.monotonic()
+    try:
+        yield attrs
+    except BaseException:
+        attrs.setdefault("status", "error")
+        raise
+    finally:
+        attrs.setdefault("status", "ok")
+        record(name, time.monotonic() - started, started, **attrs)
+
+
+def record(name: str, seconds: float, started: float = None, **attrs) -> None:
+    """Add a finished span; `started` is a time.monotonic() value (default: now - seconds)."""
+    started = time.monotonic() - seconds if started is None else started
+    entry = {"name": name, "start": round(started - _started_mono, 4), "seconds": round(seconds, 4), **attrs}
+    with _lock:
+        if len(_spans) < MAX_SPANS:
+            _spans.append(entry)
+
+
+def reset() -> None:
+    """Start a new run (a --daemon process reports each run separately)."""
+    global _started, _started_mono
+    with _lock:
+        _spans.clear()
+        _started = time.time()
+        _started_mono = time.monotonic()
+
+
+def stages() -> dict:
+    """{name: {count, seconds, max, errors, bytes, items}} aggregated over the run's spans."""
+    with _lock:
+        spans = list(_spans)
+    result = {}
+    for s in spans:
+        st = result.setdefault(s["name"], {"count": 0, "seconds": 0.0, "max": 0.0, "errors": 0, "bytes": 0, "items": 0})
+        st["count"] += 1
+        st["seconds"] += s["seconds"]
+        st["max"] = max(st["max"], s["seconds"])
+        st["errors"] += s.get("status") == "error"
+        st["bytes"] += s.get("bytes") or 0
+        st["items"] += s.get("items") or 0
+    return result
+
+
+def write_report(mode: str = "run") -> dict:
+    """Save the run's JSON report, refresh the Prometheus textfile, print the slowest stages."""
+    with _lock:
+        spans = list(_spans)
+    report = {
+        "mode": mode,
+        "started": _started,
+        "seconds": round(time.monotonic() - _started_mono, 4),
+        "stages": stages(),
+        "spans": spans,
+    }
+    try:
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(_started))
+        path = os.path.join(METRICS_DIR, f"run-{stamp}-{mode}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+        reports = sorted(n for n in os.listdir(METRICS_DIR) if n.startswith("run-"))
+        for name in reports[:max(0, len(reports) - METRICS_KEEP)]:
+            os.remove(os.path.join(METRICS_DIR, name))
+        print(f"📊 Run report: {path}")
+    except OSError as e:
+        print(f"  WARNING: cannot write run report: {e}")
+    if PROMETHEUS_TEXTFILE:
+        write_prometheus(report, PROMETHEUS_TEXTFILE)
+    print_summary(report)
+    return report
+
+
+def write_prometheus(report: dict, path: str) -> None:
+    lines = [
+        "# HELP brief_run_seconds Wall time of the last brief run.",
+        "# TYPE brief_run_seconds gauge",
+        f'brief_run_seconds{{mode="{report["mode"]}"}} {report["seconds"]}',
+        "# HELP brief_run_timestamp_seconds When the last brief run started.",
+        "# TYPE brief_run_timestamp_seconds gauge",
+        f'brief_run_timestamp_seconds{{mode="{report["mode"]}"}} {report["started"]:.0f}',
+    ]
+    for metric, field, help_text in (
+        ("brief_stage_seconds", "seconds", "Total time spent in a stage during the last run."),
+        ("brief_stage_max_seconds", "max", "Slowest single span of a stage during the last run."),
+        ("brief_stage_spans", "count", "Spans recorded for a stage during the last run."),
+        ("brief_stage_errors", "errors", "Failed spans of a stage during the last run."),
+        ("brief_stage_bytes", "bytes", "Bytes transferred by a stage during the last run."),
+    ):
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+        for name, st in sorted(report["stages"].items()):
+            value = round(st[field], 4) if isinstance(st[field], float) else st[field]
+            lines.append(f'{metric}{{stage="{name}"}} {value}')
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        print(f"  WARNING: cannot write Prometheus textfile: {e}")
+
+
+def print_summary(report: dict, top: int = 8) -> None:
+    slowest = sorted(report["stages"].items(), key=lambda kv: -kv[1]["max"])[:top]
+    if not slowest:
+        return
+    print(f"\n⏱️ Slowest stages ({report['seconds']:.1f}s run):")
+    print(f"  {'stage':<22}{'spans':>6}{'max':>9}{'total':>9}{'errors':>8}{'KB':>9}")
+    for name, st in slowest:
+        print(f"  {name:<22}{st['count']:>6}{st['max']:>8.2f}s{st['seconds']:>8.2f}s"
+              f"{st['errors']:>8}{st['bytes'] / 1024:>9.1f}")
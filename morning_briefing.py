@@ -6,41 +6,83 @@ Delivery: Telegram Bot via GitHub Actions
 """
 
 import os
+import sys
 import json
-import requests
-import xml.etree.ElementTree as ET
+import argparse
+import time
+import threading
+import hashlib
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from concurrent.futures import TimeoutError as FutureTimeout
 from datetime import datetime
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import article_text
+import extractive
+import feed_registry
+import http_client
+import metrics
+import near_dup
+import outbox
+import ranking
+import telegram_delivery
+from budget import Budget, DaemonPool
+from cache import JsonCache
+from feed_health import HEALTH
+from http_cache import get_cached, get_text
+from recipients import load_recipients
+from seen_index import SeenIndex, SEEN_TTL_DAYS, article_keys
+from snapshot_store import latest_snapshot, merge_news, save_snapshot
 
 # ── Config ────────────────────────────────────────────────────────────────────
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
 TELEGRAM_CHAT_ID   = os.getenv("TELEGRAM_CHAT_ID", "")
 OPENAI_API_KEY     = os.getenv("OPENAI_API_KEY", "")
 
-# ── RSS Feeds per Sector ───────────────────────────────────────────────────────
-SECTORS = {
-    "🤖 AI & Tech": [
-        "https://techcrunch.com/feed/",
-        "https://www.theverge.com/rss/ai-artificial-intelligence/index.xml",
-    ],
-    "₿ Crypto & Finance": [
-        "https://feeds.feedburner.com/CoinDesk",
-        "https://cointelegraph.com/rss",
-    ],
-    "🚀 Space & Astronomy": [
-        "https://www.nasa.gov/rss/dyn/breaking_news.rss",
-        "https://www.space.com/feeds/all",
-    ],
-    "🛍️ E-commerce & Retail": [
-        "https://feeds.feedburner.com/practicalecommerce",
-        "https://techcrunch.com/tag/e-commerce/feed/",
-    ],
-    "🇬🇪 Georgian Business": [
-        "https://bm.ge/rss",
-        "https://tabula.ge/geo/rss.xml",
-    ],
-}
+# Streaming delivery: post the header at once, then edit the message in place
+# as each sector summary arrives (Telegram tolerates roughly one edit a second).
+STREAM_DELIVERY        = os.getenv("STREAM_DELIVERY", "") == "1"
+TELEGRAM_EDIT_INTERVAL = float(os.getenv("TELEGRAM_EDIT_INTERVAL", "1.5"))
+STREAM_START_LIMIT     = 3.0   # seconds the placeholder may hold up fetching (one try, at least MIN_CALL_TIMEOUT)
+
+# A brief identical to one already delivered (e.g. a rerun of --send on the
+# same snapshot) is not sent twice, except when RESEND_DELIVERED=1; the
+# workflow sets it for manually dispatched runs.
+RESEND_DELIVERED = os.getenv("RESEND_DELIVERED", "") == "1"
 
+# ── RSS Feeds per Sector ───────────────────────────────────────────────────────
 ARTICLES_PER_SECTOR = 3
+FEED_CANDIDATES     = int(os.getenv("FEED_CANDIDATES", "15"))  # items read per feed before dedup/ranking
+
+# Feeds live in feeds.json (see feed_registry.py); each run polls only the
+# feeds that are due and serves the others from their last stored items.
+FEEDS   = feed_registry.load_feeds(max_items=FEED_CANDIDATES)
+SECTORS = feed_registry.by_sector(FEEDS)
+
+# With NumPy available, each sector's picks are the top-ranked candidates from
+# all of its feeds (see ranking.py) instead of the first ones in feed order.
+RANK_ARTICLES = os.getenv("RANK_ARTICLES", "1") == "1"
+
+# Concurrent fetch: every feed is requested at once, and whatever has arrived
+# when the run-wide deadline expires is used.
+FETCH_WORKERS  = int(os.getenv("FETCH_WORKERS", "16"))
+FETCH_DEADLINE = float(os.getenv("FETCH_DEADLINE", "20"))
+HEDGE_AFTER    = float(os.getenv("HEDGE_AFTER", "4"))   # a feed still loading then gets a duplicate request; 0 disables
+
+# End-to-end budget (RUN_BUDGET in budget.py, 45 s by default): every stage gets
+# its own limit, cut short so that these reserves stay free for the later stages.
+SUMMARY_RESERVE  = 8.0    # kept for summarizing while fetching
+DELIVERY_RESERVE = 10.0   # kept for Telegram while summarizing
+
+# Feeds are parsed as they stream in; reading stops after max_items entries or
+# MAX_FEED_BYTES, whichever comes first.
+MAX_FEED_BYTES = int(os.getenv("MAX_FEED_BYTES", str(1024 * 1024)))
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+
+# Optional enrichment: the picked articles' pages are fetched and their main
+# text goes into the prompt instead of the (often empty) feed summary.
+ENRICH_ARTICLES = os.getenv("ENRICH_ARTICLES", "") == "1"
 
 # ── 30-day rotating Astroman tasks ────────────────────────────────────────────
 ASTROMAN_TASKS_30 = [
@@ -81,119 +123,365 @@ def fetch_rss(url: str, max_items: int = ARTICLES_PER_SECTOR) -> list:
     """Fetch RSS/Atom feed and return list of {title, link, summary} dicts."""
     headers = {"User-Agent": "MorningBriefBot/2.0"}
     try:
-        r = requests.get(url, headers=headers, timeout=12)
-        r.raise_for_status()
-        root = ET.fromstring(r.content)
-
-        ns = ""
-        if "atom" in root.tag.lower() or root.tag.startswith("{http://www.w3.org/2005/Atom}"):
-            ns = "{http://www.w3.org/2005/Atom}"
-
-        items = []
-        if ns:
-            for entry in root.findall(f"{ns}entry")[:max_items]:
-                title = (entry.findtext(f"{ns}title") or "").strip()
-                link_el = entry.find(f"{ns}link")
-                link = link_el.get("href", "") if link_el is not None else ""
-                summary = (entry.findtext(f"{ns}summary") or entry.findtext(f"{ns}content") or "").strip()[:200]
-                if title:
-                    items.append({"title": title, "link": link, "summary": summary})
-        else:
-            channel = root.find("channel") or root
-            for item in channel.findall("item")[:max_items]:
-                title = (item.findtext("title") or "").strip()
-                link  = (item.findtext("link") or "").strip()
-                desc  = (item.findtext("description") or "").strip()[:200]
-                if title:
-                    items.append({"title": title, "link": link, "summary": desc})
-
-        return items
+        return get_cached(url, lambda r: parse_feed(r.iter_content(8192), max_items),
+                          kind=f"rss:{max_items}", headers=headers, timeout=12, stream=True)
     except Exception as e:
         print(f"  WARNING: RSS fetch failed for {url}: {e}")
         return []
 
-def get_all_news() -> dict:
-    """Fetch news for all sectors."""
+def parse_feed(chunks, max_items: int, max_bytes: int = MAX_FEED_BYTES) -> list:
+    """
+    Incrementally parse an RSS/Atom byte stream into {title, link, summary} dicts.
+    Returns as soon as max_items entries are collected or max_bytes have been read.
+    """
+    import xml.etree.ElementTree as ET   # only runs that fetch feeds need it
+    parser = ET.XMLPullParser(events=("start", "end"))
+    ns = None
+    depth = 0
+    items = []
+    read = 0
+
+    for chunk in chunks:
+        read += len(chunk)
+        parser.feed(chunk)
+        for event, el in parser.read_events():
+            if event == "start":
+                if ns is None:
+                    is_atom = "atom" in el.tag.lower() or el.tag.startswith(ATOM_NS)
+                    ns = ATOM_NS if is_atom else ""
+                depth += 1
+                continue
+            depth -= 1
+
+            if ns and el.tag == f"{ns}entry" and depth == 1:
+                title = (el.findtext(f"{ns}title") or "").strip()
+                link_el = el.find(f"{ns}link")
+                link = link_el.get("href", "") if link_el is not None else ""
+                summary = (el.findtext(f"{ns}summary") or el.findtext(f"{ns}content") or "").strip()[:200]
+                published = _parse_date(el.findtext(f"{ns}published") or el.findtext(f"{ns}updated"))
+            elif not ns and el.tag == "item" and depth <= 2:
+                title = (el.findtext("title") or "").strip()
+                link  = (el.findtext("link") or "").strip()
+                summary = (el.findtext("description") or "").strip()[:200]
+                published = _parse_date(el.findtext("pubDate"))
+            else:
+                continue
+
+            el.clear()
+            if title:
+                items.append({"title": title, "link": link, "summary": summary, "published": published})
+            if len(items) >= max_items:
+                return items
+
+        if read >= max_bytes:
+            print(f"  WARNING: feed exceeded {max_bytes} bytes, keeping {len(items)} items")
+            break
+
+    return items
+
+def _parse_date(text: str):
+    """RFC 822 (RSS) or ISO 8601 (Atom) date as a Unix timestamp, or None."""
+    if not text:
+        return None
+    text = text.strip()
+    try:
+        return parsedate_to_datetime(text).timestamp()
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(text.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+def get_all_news(deadline: float = FETCH_DEADLINE, seen: SeenIndex = None, partial: set = None) -> dict:
+    """
+    Fetch news for all sectors concurrently, bounded by a global deadline.
+    Only feeds the scheduler finds due are requested; the rest, and any that
+    miss the deadline, contribute their last stored items.
+    Articles already delivered (per `seen`) or repeated across feeds are skipped.
+    Sectors with a feed that missed the deadline are added to `partial`.
+    """
+    started = time.monotonic()
+    scheduler = feed_registry.FeedScheduler(FEEDS)
+    due = scheduler.due()
+    results = _fetch_hedged(due, deadline)
+    for feed in due:
+        if feed["url"] in results:
+            scheduler.record(feed, results[feed["url"]])
+    scheduler.save()
+    due_urls = {feed["url"] for feed in due}
+
     all_news = {}
+    taken, picked = set(), []
+    rank = RANK_ARTICLES and ranking.available()
     for sector, feeds in SECTORS.items():
-        articles = []
-        for feed_url in feeds:
-            fetched = fetch_rss(feed_url)
-            for a in fetched:
-                if a not in articles:
-                    articles.append(a)
-            if len(articles) >= ARTICLES_PER_SECTOR:
+        candidates, pool_keys = [], set()
+        for feed in feeds:
+            items = results.get(feed["url"])
+            if items is None:
+                if feed["url"] in due_urls:
+                    print(f"  WARNING: {feed['url']} missed the {deadline:.0f}s deadline")
+                    if partial is not None:
+                        partial.add(sector)
+            items = items or scheduler.stored(feed) or []
+            for a in items:
+                keys = article_keys(a)
+                if taken.intersection(keys) or pool_keys.intersection(keys) or (seen and seen.seen(a)):
+                    continue
+                pool_keys.update(keys)
+                candidates.append(a)
+            if not rank and len(candidates) >= ARTICLES_PER_SECTOR:
                 break
-        all_news[sector] = articles[:ARTICLES_PER_SECTOR]
+        if rank:
+            candidates = ranking.rank(candidates)
+        # The same story from several feeds collapses onto its best-ranked copy,
+        # and one an earlier sector already carries is left to that sector.
+        articles = near_dup.collapse(candidates, picked)[:ARTICLES_PER_SECTOR]
+        picked.extend(articles)
+        for a in articles:
+            taken.update(article_keys(a))
+        all_news[sector] = articles
         print(f"  OK {sector}: {len(all_news[sector])} articles")
+    print(f"  Polled {len(results)}/{len(due)} due feeds of {len(FEEDS)} in {time.monotonic() - started:.1f}s")
     return all_news
 
+def _fetch_hedged(feeds: list, deadline: float) -> dict:
+    """
+    {url: items} for the feeds that answered within deadline seconds. A feed
+    still loading (or failed) after HEDGE_AFTER seconds gets one duplicate
+    request, and whichever copy returns items first wins.
+    """
+    end = time.monotonic() + deadline
+    hedge_at = time.monotonic() + HEDGE_AFTER if HEDGE_AFTER > 0 else float("inf")
+    pool = DaemonPool(FETCH_WORKERS)
+    attempts = {feed["url"]: [pool.submit(fetch_rss, feed["url"], feed["max_items"])] for feed in feeds}
+    max_items = {feed["url"]: feed["max_items"] for feed in feeds}
+    results, hedged = {}, 0
+
+    while True:
+        for url, futures in attempts.items():
+            answered = [f.result() for f in futures if f.done()]
+            if url in results or not answered:
+                continue
+            final = len(answered) == len(futures) and (len(futures) == 2 or hedge_at == float("inf"))
+            if any(answered) or final:
+                results[url] = next((items for items in answered if items), [])
+        now = time.monotonic()
+        if len(results) == len(attempts) or now >= end:
+            break
+        running = [f for url, futures in attempts.items() if url not in results for f in futures if not f.done()]
+        if now >= hedge_at or not running:
+            # Slow feeds, and ones that already failed, get their second request now.
+            for url, futures in attempts.items():
+                if url not in results and len(futures) == 1:
+                    futures.append(pool.submit(fetch_rss, url, max_items[url]))
+                    hedged += 1
+            hedge_at = float("inf")
+            continue
+        wait(running, timeout=min(end, hedge_at) - now, return_when=FIRST_COMPLETED)
+
+    pool.shutdown()
+    if hedged:
+        print(f"  Sent a second request to {hedged} slow or failed feed(s)")
+    return results
+
 # ── BM.ge Scraper (Georgian Business fallback) ────────────────────────────────
-def scrape_bmge(max_items: int = 3) -> list:
-    """Scrape BM.ge top news as backup."""
+BMGE_LISTING_URL = "https://bm.ge/category/all"
+
+def scrape_bmge(max_items: int = 3, html: str = None, timeout: float = 12) -> list:
+    """Scrape BM.ge top news as backup. `html` is an already-fetched listing page."""
+    headers = {"User-Agent": "MorningBriefBot/2.0"}
     try:
-        r = requests.get("https://bm.ge/rss", headers={"User-Agent": "MorningBriefBot/2.0"}, timeout=12)
-        r.raise_for_status()
-        root = ET.fromstring(r.content)
-        items = []
-        channel = root.find("channel") or root
-        for item in channel.findall("item")[:max_items]:
-            title = (item.findtext("title") or "").strip()
-            link  = (item.findtext("link") or "").strip()
-            if title:
-                items.append({"title": title, "link": link, "summary": ""})
+        # Same cache key as fetch_rss, so a feed already read this run is not re-fetched.
+        items = get_cached("https://bm.ge/rss", lambda r: parse_feed(r.iter_content(8192), max_items),
+                           kind=f"rss:{max_items}", headers=headers, timeout=timeout, stream=True)
         if items:
-            return items
+            return [dict(a, summary="") for a in items]
     except Exception:
         pass
 
     try:
-        import re
-        r = requests.get("https://bm.ge/category/all", headers={"User-Agent": "MorningBriefBot/2.0"}, timeout=12)
-        items = []
-        seen = set()
-        matches = re.findall(r'href="(/news/[^"]+)"[^>]*>([^<]{10,})', r.text)
-        for href, text in matches:
-            url = "https://bm.ge" + href
-            title = text.strip()
-            if url not in seen and title:
-                seen.add(url)
-                items.append({"title": title, "link": url, "summary": ""})
-            if len(items) >= max_items:
-                break
-        return items
+        if html is None:
+            html = get_text(BMGE_LISTING_URL, headers=headers, timeout=timeout)
+        return _parse_bmge_html(html, max_items)
     except Exception as e:
         print(f"  WARNING: BM.ge scrape failed: {e}")
         return []
 
+def _parse_bmge_html(html: str, max_items: int) -> list:
+    import re
+    items = []
+    seen = set()
+    matches = re.findall(r'href="(/news/[^"]+)"[^>]*>([^<]{10,})', html)
+    for href, text in matches:
+        url = "https://bm.ge" + href
+        title = text.strip()
+        if url not in seen and title:
+            seen.add(url)
+            items.append({"title": title, "link": url, "summary": ""})
+        if len(items) >= max_items:
+            break
+    return items
+
 # ── AI Summarizer ─────────────────────────────────────────────────────────────
-def summarize_with_openai(all_news: dict) -> str:
-    """Send headlines to OpenAI, get bilingual digest."""
+# Summaries are memoized per sector, keyed by that sector's articles, the prompt
+# version and the model, so only sectors with new headlines go to the API.
+OPENAI_MODEL        = "gpt-4o-mini"
+PROMPT_VERSION      = "3"
+SUMMARY_CACHE_TTL   = float(os.getenv("SUMMARY_CACHE_TTL", str(2 * 24 * 3600)))
+SUMMARY_DEADLINE    = float(os.getenv("SUMMARY_DEADLINE", "20"))   # then stale sectors are summarized locally
+PRECOMPUTE_DEADLINE = float(os.getenv("PRECOMPUTE_DEADLINE", "300"))   # --precompute has time to spare
+TAKEAWAY_HEADER     = "*💡 Today's Takeaway:*"
+
+_SUMMARIES = JsonCache("summaries", ttl=SUMMARY_CACHE_TTL)
+
+def _summary_key(*parts) -> str:
+    blob = json.dumps([PROMPT_VERSION, OPENAI_MODEL, *parts], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+def _sector_key(sector: str, articles: list) -> str:
+    return _summary_key(sector, [(a["title"], a.get("summary", "")[:150]) for a in articles])
+
+def summarize_with_openai(all_news: dict, on_progress=None, timeout: float = None) -> str:
+    """
+    Send headlines to OpenAI, get bilingual digest.
+    If on_progress is given, the completion is streamed and on_progress(partial_digest)
+    is called with the cached sectors first and then each time a sector finishes.
+    Without an API key, or when the call fails or misses its deadline (timeout,
+    default SUMMARY_DEADLINE), the missing sectors are summarized locally (extractive.py).
+    """
     if not OPENAI_API_KEY:
-        return format_raw_headlines(all_news)
-
+        return local_digest(all_news)
+
+    keys = {sector: _sector_key(sector, articles) for sector, articles in all_news.items() if articles}
+    pieces = {sector: _SUMMARIES.get(key) for sector, key in keys.items()}
+    pieces = {sector: text for sector, text in pieces.items() if text}
+    takeaway_key = _summary_key("takeaway", sorted(keys.values()))
+    takeaway = _SUMMARIES.get(takeaway_key)
+
+    stale = {sector: all_news[sector] for sector in keys if sector not in pieces}
+    if stale or not takeaway:
+        print(f"  {len(pieces)} sector(s) cached, requesting {len(stale)}")
+        on_delta = None
+        abandoned = threading.Event()   # no progress reports once the result is no longer awaited
+        if on_progress:
+            if pieces:
+                on_progress(_assemble(all_news, pieces, None))
+            tracker = _progress_tracker(all_news, dict(pieces), on_progress)
+            on_delta = lambda text: None if abandoned.is_set() else tracker(text)
+        request = _in_background(_request_summaries, all_news, stale, dict(pieces), keys, takeaway_key, on_delta)
+        timeout = SUMMARY_DEADLINE if timeout is None else timeout
+        try:
+            content, fresh = request.result(timeout=timeout)
+        except FutureTimeout:
+            abandoned.set()
+            print(f"  WARNING: OpenAI missed the {timeout:.0f}s deadline, summarizing locally")
+            content, fresh = None, {}
+        except Exception as e:
+            print(f"  WARNING: OpenAI call failed: {e}")
+            content, fresh = None, {}
+
+        if content and not fresh and not pieces:
+            return content   # no sector headers to split on, and nothing cached to lose
+        pieces.update({sector: text for sector, text in fresh.items() if sector in stale})
+        takeaway = fresh.get(TAKEAWAY_HEADER, takeaway)
+        missing = {sector: all_news[sector] for sector in stale if sector not in pieces}
+        if missing:
+            pieces.update(extractive.summarize(missing))
+    else:
+        print("  All sectors cached, skipping OpenAI call")
+
+    return _assemble(all_news, pieces, takeaway)
+
+def _request_summaries(all_news: dict, stale: dict, cached: dict, keys: dict, takeaway_key: str, on_delta=None):
+    """
+    Run the OpenAI call and store what it returns, even if the caller has given up
+    waiting (a daemon or a later --send then finds it cached).
+    Returns (content, {sector or TAKEAWAY_HEADER: block}).
+    """
+    with metrics.span("llm", sectors=len(stale), streamed=on_delta is not None) as span:
+        content = _call_openai(_build_prompt(stale, cached), on_delta)
+        span["bytes"] = len(content.encode("utf-8"))
+    fresh = _split_digest(content, list(all_news))
+    for sector, text in fresh.items():
+        if sector in stale:
+            _SUMMARIES.set(keys[sector], text)
+    if TAKEAWAY_HEADER in fresh:
+        _SUMMARIES.set(takeaway_key, fresh[TAKEAWAY_HEADER])
+    return content, fresh
+
+def _in_background(fn, *args) -> Future:
+    """Run fn on a daemon thread, so a run that stops waiting for it can still exit."""
+    future = Future()
+
+    def run():
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+def local_digest(all_news: dict) -> str:
+    """Extractive digest of every sector, or the raw headline list if nothing can be extracted."""
+    pieces = extractive.summarize(all_news)
+    return _assemble(all_news, pieces, None) if pieces else format_raw_headlines(all_news)
+
+def _assemble(all_news: dict, pieces: dict, takeaway: str) -> str:
+    blocks = [pieces[sector] for sector in all_news if sector in pieces]
+    if takeaway:
+        blocks.append(takeaway)
+    return "\n\n".join(blocks)
+
+def _progress_tracker(all_news: dict, cached: dict, on_progress):
+    """Build an on_delta(text_so_far) callback that reports each newly completed sector."""
+    completed = [0]
+
+    def on_delta(text: str):
+        # Every block but the last is complete once a later header has started.
+        blocks = _split_digest(text, list(all_news))
+        done = list(blocks)[:-1]
+        if len(done) > completed[0]:
+            completed[0] = len(done)
+            pieces = dict(cached)
+            pieces.update({name: blocks[name] for name in done if name in all_news})
+            on_progress(_assemble(all_news, pieces, None))
+
+    return on_delta
+
+def _build_prompt(stale: dict, cached: dict) -> str:
     news_block = ""
-    for sector, articles in all_news.items():
+    for sector, articles in stale.items():
         news_block += f"\n## {sector}\n"
-        if articles:
-            for i, a in enumerate(articles, 1):
-                news_block += f"{i}. {a['title']}\n"
-                if a.get("summary"):
-                    news_block += f"   Context: {a['summary'][:150]}\n"
-        else:
-            news_block += "No articles available.\n"
-
-    prompt = f"""You are a sharp morning news editor writing a daily brief for Rezi — a Georgian entrepreneur who runs a telescope shop (Astroman.ge) and follows tech, crypto, space, e-commerce, and Georgian business news.
+        for i, a in enumerate(articles, 1):
+            news_block += f"{i}. {a['title']}\n"
+            if a.get("body"):
+                news_block += f"   Article: {a['body']}\n"
+            elif a.get("summary"):
+                news_block += f"   Context: {a['summary'][:150]}\n"
+            if a.get("also"):
+                news_block += f"   Also covered by: {', '.join(_hosts(a['also']))}\n"
+    if not news_block:
+        news_block = "\n(No new headlines — every sector is already summarized below.)\n"
+
+    cached_block = ""
+    if cached:
+        cached_block = (
+            "\nThese sectors are already summarized. Do NOT rewrite them; use them only for the takeaway:\n\n"
+            + "\n\n".join(cached.values()) + "\n"
+        )
 
-Here are today's top headlines from 5 sectors:
-{news_block}
+    return f"""You are a sharp morning news editor writing a daily brief for Rezi — a Georgian entrepreneur who runs a telescope shop (Astroman.ge) and follows tech, crypto, space, e-commerce, and Georgian business news.
 
+Here are today's top headlines:
+{news_block}{cached_block}
 Write a clean morning digest with these exact rules:
-1. For each sector with news, write 2-3 sentences summarizing the key stories — first in ENGLISH, then the same summary in GEORGIAN (ქართული).
+1. For each sector listed under the headlines, write 2-3 sentences summarizing the key stories — first in ENGLISH, then the same summary in GEORGIAN (ქართული).
 2. Keep each sector summary tight: what happened + why it matters to an entrepreneur like Rezi.
 3. Use Telegram Markdown: *bold* for sector names, plain text for summaries.
-4. Skip sectors with no news gracefully.
-5. Add one sentence at the end (in both languages) with a practical "so what?" for Rezi's business or mindset.
+4. Start each sector with its name exactly as given, e.g. *🤖 AI & Tech* on its own line.
+5. Add one sentence at the end (in both languages) with a practical "so what?" for Rezi's business or mindset, drawing on all sectors.
 
 Format:
 *🤖 AI & Tech*
@@ -207,31 +495,68 @@ Format:
 ... and so on.
 
 End with:
-*💡 Today's Takeaway:*
+{TAKEAWAY_HEADER}
 [English]
 [Georgian]"""
 
-    try:
-        response = requests.post(
-            "https://api.openai.com/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {OPENAI_API_KEY}",
-                "Content-Type": "application/json",
-            },
-            json={
-                "model": "gpt-4o-mini",
-                "messages": [{"role": "user", "content": prompt}],
-                "max_tokens": 1200,
-                "temperature": 0.7,
-            },
-            timeout=30,
-        )
-        response.raise_for_status()
+def _call_openai(prompt: str, on_delta=None) -> str:
+    """Run the chat completion; with on_delta, stream it and report the text so far."""
+    response = http_client.post(
+        "https://api.openai.com/v1/chat/completions",
+        headers={
+            "Authorization": f"Bearer {OPENAI_API_KEY}",
+            "Content-Type": "application/json",
+        },
+        json={
+            "model": OPENAI_MODEL,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": 1200,
+            "temperature": 0.7,
+            "stream": on_delta is not None,
+        },
+        timeout=30,
+        stream=on_delta is not None,
+    )
+    response.raise_for_status()
+    if on_delta is None:
         data = response.json()
         return data["choices"][0]["message"]["content"].strip()
-    except Exception as e:
-        print(f"  WARNING: OpenAI call failed: {e}")
-        return format_raw_headlines(all_news)
+
+    text = ""
+    response.encoding = "utf-8"
+    for line in response.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue
+        payload = line[len("data:"):].strip()
+        if payload == "[DONE]":
+            break
+        delta = json.loads(payload)["choices"][0]["delta"].get("content") or ""
+        text += delta
+        if "\n" in delta:
+            on_delta(text)
+    response.close()
+    return text.strip()
+
+def _split_digest(content: str, sectors: list) -> dict:
+    """
+    Split a digest into {sector or TAKEAWAY_HEADER: block} on its header lines.
+    Headers are matched however the model decorated them (**bold**, ## heading,
+    a trailing colon) and rewritten as the *bold* header the brief uses.
+    """
+    headers = {_header_name(f"*{sector}*"): (sector, f"*{sector}*") for sector in sectors}
+    headers[_header_name(TAKEAWAY_HEADER)] = (TAKEAWAY_HEADER, TAKEAWAY_HEADER)
+    blocks, current = {}, None
+    for line in content.splitlines():
+        name, header = headers.get(_header_name(line), (None, None))
+        if name:
+            current = name
+            blocks[current] = [header]
+        elif current:
+            blocks[current].append(line)
+    return {name: "\n".join(lines).strip() for name, lines in blocks.items()}
+
+def _header_name(line: str) -> str:
+    return line.strip().strip("*_#: ").strip().casefold()
 
 def format_raw_headlines(all_news: dict) -> str:
     """Fallback: list raw headlines without AI summarization."""
@@ -242,31 +567,43 @@ def format_raw_headlines(all_news: dict) -> str:
             for a in articles:
                 title = a["title"][:100]
                 link  = a.get("link", "")
+                also  = f" _(also: {', '.join(_hosts(a['also']))})_" if a.get("also") else ""
                 if link:
-                    lines.append(f"• [{title}]({link})")
+                    lines.append(f"• [{title}]({link}){also}")
                 else:
-                    lines.append(f"• {title}")
+                    lines.append(f"• {title}{also}")
         else:
             lines.append("_No news available._")
         lines.append("")
     return "\n".join(lines).strip()
 
+def _hosts(links: list) -> list:
+    hosts = []
+    for link in links:
+        host = urlsplit(link).netloc.lower().removeprefix("www.")
+        if host and host not in hosts:
+            hosts.append(host)
+    return hosts
+
 # ── Message Builder ────────────────────────────────────────────────────────────
-def build_message(ai_digest: str, tasks: list) -> str:
+def build_header() -> str:
     now = datetime.now()
     day_names_geo = ["ორშაბათი", "სამშაბათი", "ოთხშაბათი", "ხუთშაბათი", "პარასკევი", "შაბათი", "კვირა"]
     day_geo = day_names_geo[now.weekday()]
     date_en = now.strftime("%B %d, %Y")
 
-    t1, t2, t3 = tasks
-
-    message = (
+    return (
         f"🌅 *დილა მშვიდობისა! Good Morning, Rezi!*\n"
         f"📅 {day_geo} | {date_en}\n\n"
         f"━━━━━━━━━━━━━━━━━━━━\n"
         f"📰 *TODAY'S INTEL:*\n"
-        f"━━━━━━━━━━━━━━━━━━━━\n\n"
-        f"{ai_digest}\n\n"
+        f"━━━━━━━━━━━━━━━━━━━━"
+    )
+
+def build_footer(tasks: list) -> str:
+    t1, t2, t3 = tasks
+
+    return (
         f"━━━━━━━━━━━━━━━━━━━━\n"
         f"🪐 *ASTROMAN — Top 3 Tasks Today:*\n"
         f"1️⃣ {t1}\n"
@@ -276,60 +613,343 @@ def build_message(ai_digest: str, tasks: list) -> str:
         f"🚀 *დღეს შენი დღეა — Make it count!* 💪"
     )
 
-    return message.strip()
+def build_message(ai_digest: str, tasks: list, partial: set = None) -> str:
+    with metrics.span("build_message") as span:
+        if partial:
+            ai_digest += f"\n\n⏳ _Partial: {', '.join(sorted(partial))} (some feeds missed the deadline)_"
+        message = f"{build_header()}\n\n{ai_digest}\n\n{build_footer(tasks)}".strip()
+        span["bytes"] = len(message.encode("utf-8"))
+    return message
 
 # ── Telegram Sender ───────────────────────────────────────────────────────────
-def send_telegram(message: str) -> bool:
+def send_telegram(message: str, deadline: float = None, articles: list = ()) -> bool:
+    """
+    Send through the outbox: the chunks are stored first, and a failed send is
+    retried from the first unsent chunk until `deadline`, then left for the next run.
+    """
     if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
         print("WARNING: Telegram credentials not set.")
         return False
 
-    chunks = [message[i:i+4000] for i in range(0, len(message), 4000)]
-
-    for chunk in chunks:
-        url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-        payload = {
-            "chat_id": TELEGRAM_CHAT_ID,
-            "text": chunk,
-            "parse_mode": "Markdown",
-            "disable_web_page_preview": True,
-        }
-        try:
-            r = requests.post(url, json=payload, timeout=15)
-            if r.status_code != 200:
-                print(f"ERROR: Telegram {r.status_code} | {r.text}")
-                return False
-        except Exception as e:
-            print(f"ERROR: Telegram exception: {e}")
+    entry = outbox.enqueue(TELEGRAM_CHAT_ID, message, articles, resend=RESEND_DELIVERED)
+    if entry["done"]:
+        print(f"Brief {entry['id']} was already delivered, not sending it again (RESEND_DELIVERED=1 to force).")
+        return True
+    if not outbox.send(entry, TELEGRAM_BOT_TOKEN, deadline):
+        if entry.get("dead") or not outbox.drain(TELEGRAM_BOT_TOKEN, deadline, [entry]):
+            if not entry.get("dead"):
+                print(f"  Brief kept in the outbox ({entry['sent']}/{len(entry['chunks'])} chunks sent); "
+                      "the next run will resume it.")
             return False
 
     print(f"SUCCESS: Brief sent at {datetime.now().strftime('%H:%M')}")
     return True
 
-# ── Main ──────────────────────────────────────────────────────────────────────
-def main():
-    print("🌅 Rezi Morning Brief v2.0 starting...\n")
+def flush_outbox(seen: SeenIndex = None, deadline: float = None) -> bool:
+    """
+    Resume briefs an earlier run left undelivered, for up to OUTBOX_RESUME_WINDOW
+    seconds. True if one was delivered (the caller then builds nothing); False if
+    there was none or none got through, and a new brief (superseding them) is due.
+    """
+    entries = [e for e in outbox.pending() if str(e["chat_id"]) == str(TELEGRAM_CHAT_ID)]
+    if not entries or not TELEGRAM_BOT_TOKEN:
+        return False
+    print(f"📮 Resuming {len(entries)} undelivered brief(s) from the outbox...")
+    resume_until = time.monotonic() + outbox.OUTBOX_RESUME_WINDOW
+    with metrics.span("outbox", items=len(entries)) as span:
+        for entry in entries:
+            entry["next_try"] = 0   # the rerun itself is the retry
+        delivered = outbox.drain(TELEGRAM_BOT_TOKEN, min(deadline or resume_until, resume_until), entries)
+        if len(delivered) < len(entries):
+            span["status"] = "error"
+    for entry in delivered:
+        print(f"SUCCESS: Brief {entry['id']} delivered ({len(entry['chunks'])} chunks)")
+        if seen:
+            seen.mark(entry["articles"])
+    if not delivered:
+        print("  No undelivered brief got through, building a new one")
+    return bool(delivered)
+
+class LiveMessage:
+    """
+    A Telegram message sent once and then edited in place, at most every
+    TELEGRAM_EDIT_INTERVAL s. Progress edits may come from the OpenAI thread;
+    edits are serialized, and once finish() has begun no progress edit is made,
+    so a late partial digest can never replace the final message.
+    """
+
+    def __init__(self, text: str, deadline: float = None):
+        self.text = text
+        self.message_id = None
+        self.closed = False
+        self._edited_at = 0.0
+        self._lock = threading.Lock()
+        r = telegram_delivery.send_chunk(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, text, deadline=deadline)
+        if r is not None and r.status_code == 200:
+            self.message_id = r.json()["result"]["message_id"]
+            self._edited_at = time.monotonic()
+        else:
+            print(f"ERROR: Telegram {getattr(r, 'status_code', '?')} | {getattr(r, 'text', '')}")
+
+    def update(self, text: str, force: bool = False, deadline: float = None) -> bool:
+        with self._lock:
+            if self.closed:
+                return False
+            return self._edit(text, force, deadline)
+
+    def _edit(self, text: str, force: bool, deadline: float) -> bool:
+        if self.message_id is None:
+            return False
+        text = telegram_delivery.split_message(text)[0]
+        if text == self.text:
+            return True
+        if not force and time.monotonic() - self._edited_at < TELEGRAM_EDIT_INTERVAL:
+            return True
+        try:
+            r = telegram_delivery.call(TELEGRAM_BOT_TOKEN, "editMessageText", {
+                "chat_id": TELEGRAM_CHAT_ID,
+                "message_id": self.message_id,
+                "text": text,
+                "parse_mode": "Markdown",
+                "disable_web_page_preview": True,
+            }, deadline=deadline)
+        except Exception as e:
+            print(f"  WARNING: Telegram edit exception: {e}")
+            return False
+        self._edited_at = time.monotonic()
+        if r is None or r.status_code != 200:
+            print(f"  WARNING: Telegram edit {getattr(r, 'status_code', '?')} | {getattr(r, 'text', '')}")
+            return False
+        self.text = text
+        return True
+
+    def finish(self, message: str, deadline: float = None, articles: list = ()) -> bool:
+        """Show the complete message; whatever does not fit is sent as follow-up chunks."""
+        with self._lock:   # waits for an edit in flight, then shuts out later ones
+            self.closed = True
+            shown = self._edit(message, True, deadline)
+        if not shown:
+            return send_telegram(message, deadline, articles)
+        rest = telegram_delivery.split_message(message)[1:]
+        if rest:
+            return send_telegram("\n\n".join(rest), deadline, articles)
+        print(f"SUCCESS: Brief sent at {datetime.now().strftime('%H:%M')}")
+        return True
 
+# ── Main ──────────────────────────────────────────────────────────────────────
+def collect_news(seen: SeenIndex = None, budget: Budget = None, partial: set = None) -> dict:
+    """Feeds, BM.ge fallback and enrichment, each within its share of `budget` (unbounded if None)."""
+    budget = budget or Budget(0)
     print("📡 Fetching news feeds...")
-    all_news = get_all_news()
+    all_news = get_all_news(budget.allot(FETCH_DEADLINE, SUMMARY_RESERVE), seen, partial)
+    all_news = fill_bmge_fallback(all_news, seen, timeout=budget.allot(12, SUMMARY_RESERVE))
+    return enrich_news(all_news, budget.allot(article_text.ENRICH_DEADLINE, SUMMARY_RESERVE))
 
+def fill_bmge_fallback(all_news: dict, seen: SeenIndex = None, html: str = None, timeout: float = 12) -> dict:
     if not all_news.get("🇬🇪 Georgian Business"):
+        if timeout <= 0:
+            print("  WARNING: no time left for the BM.ge fallback")
+            return all_news
         print("  Trying BM.ge scrape...")
-        all_news["🇬🇪 Georgian Business"] = scrape_bmge()
+        with metrics.span("bmge_fallback") as span:
+            # Retries and a second URL can take several timeouts; the stage gets one.
+            try:
+                fallback = _in_background(scrape_bmge, FEED_CANDIDATES, html, timeout).result(timeout=timeout)
+            except FutureTimeout:
+                print(f"  WARNING: BM.ge fallback missed its {timeout:.0f}s deadline")
+                span["status"] = "timeout"
+                fallback = []
+            if seen:
+                fallback = [a for a in fallback if not seen.seen(a)]
+            all_news["🇬🇪 Georgian Business"] = fallback[:ARTICLES_PER_SECTOR]
+            span["items"] = len(all_news["🇬🇪 Georgian Business"])
+    return all_news
 
-    print("\n🤖 Summarizing with OpenAI...")
-    ai_digest = summarize_with_openai(all_news)
+def enrich_news(all_news: dict, deadline: float = article_text.ENRICH_DEADLINE) -> dict:
+    if not ENRICH_ARTICLES or deadline <= 0:
+        return all_news
+    print("📄 Fetching article text...")
+    with metrics.span("enrich"):
+        return article_text.enrich(all_news, deadline)
 
+def todays_tasks() -> list:
     day_idx = (datetime.now().timetuple().tm_yday - 1) % 30
-    tasks = ASTROMAN_TASKS_30[day_idx]
-
-    message = build_message(ai_digest, tasks)
+    return ASTROMAN_TASKS_30[day_idx]
 
+def deliver(message: str, all_news: dict, seen: SeenIndex = None, live: LiveMessage = None,
+            deadline: float = None) -> bool:
+    """Send to the main chat (retrying only until `deadline`, a monotonic time), then broadcast."""
     print("\n" + "=" * 60)
     print(message)
     print("=" * 60 + "\n")
 
-    send_telegram(message)
+    delivered = [a for articles in all_news.values() for a in articles]
+    delivered += [{"link": link} for a in delivered for link in a.get("also", [])]
+    sent = live.finish(message, deadline, delivered) if live else send_telegram(message, deadline, delivered)
+
+    recipients = [r for r in load_recipients() if r != str(TELEGRAM_CHAT_ID)]
+    if recipients:
+        from broadcast import broadcast   # asyncio costs ~30 ms to import; only broadcasts need it
+        results = broadcast(TELEGRAM_BOT_TOKEN, message, recipients)
+        sent = sent or any(r["ok"] for r in results)
+
+    if sent and seen:
+        seen.mark(delivered)
+    return sent
+
+def run_brief():
+    print("🌅 Rezi Morning Brief v2.0 starting...\n")
+    budget = Budget()
+    partial = set()
+
+    seen = SeenIndex() if SEEN_TTL_DAYS > 0 else None
+    if flush_outbox(seen, budget.deadline):
+        return
+
+    live = None
+    if STREAM_DELIVERY and TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID:
+        try:
+            live = LiveMessage(f"{build_header()}\n\n⏳ _Gathering today's news..._",
+                               time.monotonic() + budget.allot(STREAM_START_LIMIT))
+        except Exception as e:
+            print(f"  WARNING: streaming delivery disabled: {e}")
+
+    with metrics.span("collect") as span:
+        all_news = collect_news(seen, budget, partial)
+        span["items"] = sum(len(articles) for articles in all_news.values())
+
+    print("\n🤖 Summarizing with OpenAI...")
+    summary_limit = budget.allot(SUMMARY_DEADLINE, DELIVERY_RESERVE)
+    summary_end = time.monotonic() + summary_limit
+    on_progress = None
+    if live:
+        on_progress = lambda digest: live.update(f"{build_header()}\n\n{digest}", deadline=summary_end)
+    with metrics.span("summarize"):
+        ai_digest = summarize_with_openai(all_news, on_progress, summary_limit)
+
+    message = build_message(ai_digest, todays_tasks(), partial)
+    with metrics.span("deliver") as span:
+        span["status"] = "ok" if deliver(message, all_news, seen, live, budget.deadline) else "error"
+    print(f"⏱️ Run took {budget.elapsed():.1f}s")
+
+# ── Prefetch / Send ───────────────────────────────────────────────────────────
+# Overnight runs collect feeds into snapshots (--prefetch) and summarize the
+# newest one shortly before the deadline (--precompute); --send then only reads
+# that snapshot, so delivery time no longer depends on feed or LLM latency.
+def prefetch() -> dict:
+    seen = SeenIndex() if SEEN_TTL_DAYS > 0 else None
+    all_news = collect_news(seen)
+    previous = latest_snapshot()
+    if previous:
+        all_news = merge_news(all_news, previous["news"], ARTICLES_PER_SECTOR)
+    path = save_snapshot(all_news)
+    print(f"💾 Snapshot saved: {path}")
+    return all_news
+
+def precompute() -> None:
+    snapshot = latest_snapshot()
+    all_news = snapshot["news"] if snapshot else prefetch()
+    print("\n🤖 Precomputing digest...")
+    digest = summarize_with_openai(all_news, timeout=PRECOMPUTE_DEADLINE)
+    path = save_snapshot(all_news, digest)
+    print(f"💾 Digest saved: {path}")
+
+def send_prefetched() -> None:
+    if flush_outbox(SeenIndex() if SEEN_TTL_DAYS > 0 else None):
+        return
+    snapshot = latest_snapshot()
+    if not snapshot or not snapshot.get("digest"):
+        print("No fresh precomputed snapshot, running the full pipeline.")
+        run_brief()
+        return
+
+    age = (time.time() - snapshot["created"]) / 60
+    print(f"📦 Sending snapshot from {age:.0f} min ago")
+    seen = SeenIndex() if SEEN_TTL_DAYS > 0 else None
+    message = build_message(snapshot["digest"], todays_tasks())
+    deliver(message, snapshot["news"], seen)
+
+def main():
+    parser = argparse.ArgumentParser(description="Rezi Morning Brief")
+    parser.add_argument("--daemon", action="store_true",
+                        help="stay resident and run at DAEMON_SCHEDULE times")
+    parser.add_argument("--prefetch", action="store_true",
+                        help="collect feeds into a snapshot without sending")
+    parser.add_argument("--precompute", action="store_true",
+                        help="summarize the newest snapshot ahead of the send")
+    parser.add_argument("--send", action="store_true",
+                        help="send the newest precomputed snapshot (full run if none)")
+    parser.add_argument("--trigger", action="store_true",
+                        help="ask a running daemon to send the brief now")
+    parser.add_argument("--status", action="store_true",
+                        help="print a running daemon's status")
+    parser.add_argument("--record", metavar="PATH",
+                        help="save every upstream HTTP exchange to a replay archive (.json.gz)")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="answer every upstream HTTP request from a replay archive, offline")
+    parser.add_argument("--replay-latency", action="store_true",
+                        help="with --replay, wait as long as each recorded exchange took")
+    args = parser.parse_args()
+
+    if (args.record or args.replay) and not os.getenv("BRIEF_SCRATCH_RUN"):
+        sys.exit(run_isolated())
+    if args.record or args.replay:
+        import replay
+        if args.replay:
+            replay.start_replay(args.replay, latency=args.replay_latency)
+        else:
+            replay.start_recording()
+    try:
+        run_mode(args)
+    finally:
+        if args.record and not args.replay:
+            replay.save_recording(args.record)
+
+def run_isolated() -> int:
+    """
+    Rerun this command against an empty scratch cache dir, removed afterwards.
+    A recording then misses nothing the caches, the schedule or the seen index
+    would have absorbed, and a replay neither reads nor changes the real state.
+    Only the metrics report is written where it normally is.
+    """
+    import shutil
+    import tempfile
+    import subprocess
+    scratch = tempfile.mkdtemp(prefix="brief-scratch-")
+    env = {k: v for k, v in os.environ.items()
+           if k not in ("HEALTH_FILE", "SCHEDULE_FILE", "SEEN_DB", "SNAPSHOT_DIR", "OUTBOX_DIR", "DAEMON_SOCKET")}
+    env.update(BRIEF_CACHE_DIR=scratch, BRIEF_SCRATCH_RUN="1", METRICS_DIR=metrics.METRICS_DIR)
+    try:
+        return subprocess.call([sys.executable, os.path.abspath(__file__), *sys.argv[1:]], env=env)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+def run_mode(args):
+    if args.trigger or args.status:
+        import brief_daemon
+        print(brief_daemon.send_command("run" if args.trigger else "status"))
+    elif args.prefetch:
+        reported(prefetch, "prefetch")()
+    elif args.precompute:
+        reported(precompute, "precompute")()
+    elif args.send:
+        reported(send_prefetched, "send")()
+    elif args.daemon:
+        import brief_daemon
+        brief_daemon.serve(reported(run_brief, "daemon"))
+    else:
+        reported(run_brief, "run")()
+
+def reported(job, mode: str):
+    """Wrap job so each call is one measured run whose metrics report is written, even on failure."""
+    def run():
+        metrics.reset()
+        HEALTH.begin_run()
+        try:
+            return job()
+        finally:
+            metrics.write_report(mode)
+    return run
 
 if __name__ == "__main__":
     main()
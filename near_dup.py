@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate story detection across feeds.
+Each article's title and summary become word n-gram shingles (stopwords
+dropped, words crudely stemmed), so one story under two different headlines
+still matches on its summary, and the shingles get a MinHash signature. Signatures are split into LSH bands and indexed by band value, so
+only articles sharing a band are compared, and cost stays linear in the number
+of candidates. Candidates are confirmed by exact Jaccard similarity.
+"""
+
+import os
+import re
+import random
+import hashlib
+
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.3"))   # Jaccard similarity of the shingles
+SHINGLE_WORDS      = 2
+MINHASH_PERMS      = 64
+LSH_BANDS          = 32   # 2 rows per band: a pair at the threshold becomes a candidate ~95% of the time
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240601)
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(MINHASH_PERMS)]
+
+_STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "with", "at", "by", "from",
+    "is", "are", "was", "be", "as", "its", "it", "this", "that", "new", "after", "over", "says",
+}
+_WORD_RE = re.compile(r"\w+")
+
+
+def shingles(article: dict) -> set:
+    """SHINGLE_WORDS-word n-grams of the title followed by the summary."""
+    text = f"{article.get('title', '')} {article.get('summary', '')[:200]}".casefold()
+    words = [w[:7] for w in _WORD_RE.findall(text) if w not in _STOPWORDS]
+    n = min(SHINGLE_WORDS, len(words))
+    return {" ".join(words[i:i + n]) for i in range(len(words) - n + 1)} if n else set()
+
+
+def minhash(tokens: set) -> tuple:
+    hashes = [int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=8).digest(), "big") for t in tokens]
+    if not hashes:
+        return ()
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS)
+
+
+def clusters(articles: list, threshold: float = NEAR_DUP_THRESHOLD) -> list:
+    """Groups of indices into `articles`, each group one story, in first-seen order."""
+    sets = [shingles(a) for a in articles]
+    parent = list(range(len(articles)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    rows = MINHASH_PERMS // LSH_BANDS
+    index = {}
+    for i, tokens in enumerate(sets):
+        signature = minhash(tokens)
+        if not signature:
+            continue
+        compared = set()
+        for band in range(LSH_BANDS):
+            key = (band, signature[band * rows:(band + 1) * rows])
+            for j in index.get(key, ()):
+                if j in compared:
+                    continue
+                compared.add(j)
+                ri, rj = find(i), find(j)
+                if ri != rj and len(tokens & sets[j]) / len(tokens | sets[j]) >= threshold:
+                    parent[max(ri, rj)] = min(ri, rj)
+            index.setdefault(key, []).append(i)
+
+    groups = {}
+    for i in range(len(articles)):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+
+def collapse(articles: list, picked: list = ()) -> list:
+    """
+    One representative per story: the first in list order (the best-ranked when
+    the list is ranked). The other articles' links are kept under "also".
+    Stories already in `picked` (e.g. chosen for an earlier sector) are dropped,
+    their links added to the picked article's "also" instead.
+    """
+    offset = len(picked)
+    everything = list(picked) + list(articles)
+    result = []
+    for group in clusters(everything):
+        own = [i - offset for i in group if i >= offset]
+        if not own:
+            continue
+        if group[0] < offset:
+            earlier = picked[group[0]]
+            links = [articles[i]["link"] for i in own if articles[i].get("link")]
+            earlier["also"] = list(dict.fromkeys(earlier.get("also", []) + links))
+            continue
+        rep = dict(articles[own[0]])
+        also = [articles[i]["link"] for i in own[1:] if articles[i].get("link")]
+        if also:
+            rep["also"] = also
+        result.append(rep)
+    return result
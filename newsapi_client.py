@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+NewsAPI client shared by the English briefing and the workflow-directory bot.
+Topic queries run concurrently; results are cached for NEWSAPI_CACHE_TTL, so a
+rerun makes no API calls; and the free-tier quota is tracked from response
+headers and 429s, degrading to cached results instead of failing.
+"""
+
+import os
+import time
+from budget import DaemonPool
+from cache import JsonCache
+from http_cache import get_cached, peek
+
+NEWSAPI_URL       = "https://newsapi.org/v2/everything"
+NEWSAPI_CACHE_TTL = float(os.getenv("NEWSAPI_CACHE_TTL", str(3 * 3600)))
+NEWSAPI_WORKERS   = int(os.getenv("NEWSAPI_WORKERS", "6"))
+QUOTA_BACKOFF     = 12 * 3600   # assume a rate-limited key recovers within half a day
+
+TOPIC_KEYWORDS = {
+    "crypto": "cryptocurrency OR bitcoin OR ethereum",
+    "ai": "artificial intelligence OR AI OR machine learning",
+    "space": "astronomy OR space OR NASA OR SpaceX",
+    "tech": "technology OR startup OR innovation",
+    "stocks": "stock market OR trading OR nasdaq",
+    "ecommerce": "e-commerce OR online shopping OR retail",
+}
+
+_QUOTA = JsonCache("newsapi-quota", ttl=2 * QUOTA_BACKOFF)
+
+
+def _params(api_key: str, query: str, page_size: int) -> dict:
+    return {
+        "q": query,
+        "language": "en",
+        "sortBy": "publishedAt",
+        "pageSize": page_size,
+        "apiKey": api_key,
+    }
+
+
+def quota() -> dict:
+    return _QUOTA.get("quota") or {"remaining": None, "exhausted_until": 0}
+
+
+def _track_quota(r) -> None:
+    remaining = r.headers.get("X-RateLimit-Remaining") or r.headers.get("X-Ratelimit-Remaining")
+    if remaining is not None and remaining.isdigit():
+        state = quota()
+        state["remaining"] = int(remaining)
+        if state["remaining"] == 0:
+            reset = r.headers.get("X-RateLimit-Reset", "")
+            state["exhausted_until"] = float(reset) if reset.isdigit() else time.time() + QUOTA_BACKOFF
+        _QUOTA.set("quota", state)
+
+
+def _mark_exhausted() -> None:
+    _QUOTA.set("quota", {"remaining": 0, "exhausted_until": time.time() + QUOTA_BACKOFF})
+
+
+def _parse(r) -> list:
+    _track_quota(r)
+    return r.json().get("articles", [])
+
+
+def _fetch_topic(api_key: str, query: str, page_size: int, timeout: float) -> list:
+    params = _params(api_key, query, page_size)
+    try:
+        return get_cached(NEWSAPI_URL, _parse, kind="newsapi", params=params,
+                          timeout=timeout, fresh_for=NEWSAPI_CACHE_TTL)
+    except Exception as e:
+        response = getattr(e, "response", None)
+        if response is not None and response.status_code == 429:
+            print("  WARNING: NewsAPI quota exhausted, serving cached results")
+            _mark_exhausted()
+        return peek(NEWSAPI_URL, kind="newsapi", params=params) or []
+
+
+def fetch_topics(api_key: str, topics: dict = TOPIC_KEYWORDS, page_size: int = 1,
+                 want: int = None, timeout: float = 12) -> dict:
+    """
+    {topic: [articles]} in `topics` order. With `want`, topics are queried in
+    concurrent rounds only until that many topics have articles.
+    """
+    names = list(topics)
+    want = len(names) if want is None else want
+    results = {}
+
+    if time.time() < quota()["exhausted_until"]:
+        for name in names:
+            results[name] = peek(NEWSAPI_URL, kind="newsapi", params=_params(api_key, topics[name], page_size)) or []
+        return results
+
+    pending = list(names)
+    pool = DaemonPool(NEWSAPI_WORKERS)
+    try:
+        while pending:
+            missing = want - sum(1 for arts in results.values() if arts)
+            if missing <= 0:
+                break
+            batch, pending = pending[:missing], pending[missing:]
+            futures = [pool.submit(_fetch_topic, api_key, topics[name], page_size, timeout) for name in batch]
+            results.update(zip(batch, (f.result() for f in futures)))
+    finally:
+        pool.shutdown()
+    return {name: results[name] for name in names if name in results}
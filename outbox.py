@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Durable outbox for Telegram delivery.
+A rendered brief is split into chunks and written to OUTBOX_DIR before the
+first one is sent; each chunk is marked sent as soon as Telegram accepts it.
+When a send fails part-way, the entry stays pending and is retried with
+exponential backoff from its first unsent chunk, either within the same run
+or by the next run, which then only flushes the outbox instead of fetching
+and summarizing again.
+
+A chunk Telegram refuses outright (a 4xx other than 429) will not be accepted
+on retry either: its entry is marked dead and no longer blocks later runs.
+A new brief for a chat supersedes that chat's older undelivered ones.
+
+The entry id is derived from the chat and the message text, so enqueueing the
+same brief twice never sends it twice (unless `resend` is asked for, as manual
+runs do); each chunk's key is "<id>:<index>". Telegram has no idempotent send,
+so a chunk whose reply was lost in transit can still arrive twice.
+"""
+
+import os
+import json
+import time
+import hashlib
+
+import telegram_delivery
+from cache import CACHE_DIR
+
+OUTBOX_DIR           = os.getenv("OUTBOX_DIR", os.path.join(CACHE_DIR, "outbox"))
+OUTBOX_MAX_AGE       = float(os.getenv("OUTBOX_MAX_AGE", str(12 * 3600)))   # older pending briefs are dropped
+OUTBOX_BACKOFF       = float(os.getenv("OUTBOX_BACKOFF", "2"))              # first retry delay, doubled per failure
+OUTBOX_MAX_BACKOFF   = float(os.getenv("OUTBOX_MAX_BACKOFF", "300"))
+OUTBOX_RETRY_WINDOW  = float(os.getenv("OUTBOX_RETRY_WINDOW", "60"))        # in-run retries without a deadline
+OUTBOX_RESUME_WINDOW = float(os.getenv("OUTBOX_RESUME_WINDOW", "10"))       # a rerun's retries before rebuilding
+OUTBOX_KEEP          = 20                                                   # delivered/dead entries kept on disk
+
+
+def message_id(chat_id, message: str) -> str:
+    return hashlib.sha256(f"{chat_id}\n{message}".encode("utf-8")).hexdigest()[:16]
+
+
+def chunk_key(entry: dict, index: int) -> str:
+    return f"{entry['id']}:{index}"
+
+
+def _path(entry_id: str) -> str:
+    return os.path.join(OUTBOX_DIR, f"{entry_id}.json")
+
+
+def _save(entry: dict) -> None:
+    os.makedirs(OUTBOX_DIR, exist_ok=True)
+    path = _path(entry["id"])
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(entry, f, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+
+
+def _load(path: str):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def enqueue(chat_id, message: str, articles: list = (), resend: bool = False) -> dict:
+    """
+    Write the message and its chunks to the outbox and return the entry.
+    `articles` ({"link", "title"} dicts) are marked seen once the last chunk is delivered.
+    An identical message already in the outbox is returned as it is (delivered
+    ones included, unless `resend` is set); a dead one starts over.
+    Older undelivered entries for the chat are superseded.
+    """
+    entry_id = message_id(chat_id, message)
+    existing = _load(_path(entry_id))
+    if existing and not existing.get("dead") and not (resend and existing["done"]):
+        return existing
+    for older in pending():
+        if str(older["chat_id"]) == str(chat_id) and older["id"] != entry_id:
+            print(f"  Superseding undelivered brief {older['id']} with a new one")
+            _kill(older, "superseded")
+    now = time.time()
+    entry = {
+        "id": entry_id,
+        "created": now,
+        "chat_id": chat_id,
+        "chunks": telegram_delivery.split_message(message),
+        "sent": 0,
+        "attempts": 0,
+        "next_try": now,
+        "done": False,
+        "dead": False,
+        "error": "",
+        "articles": [{"link": a.get("link", ""), "title": a.get("title", "")} for a in articles],
+    }
+    _save(entry)
+    return entry
+
+
+def pending(max_age: float = OUTBOX_MAX_AGE) -> list:
+    """Undelivered entries, oldest first; those older than max_age are dropped."""
+    try:
+        names = os.listdir(OUTBOX_DIR)
+    except OSError:
+        return []
+    entries, done = [], []
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        entry = _load(os.path.join(OUTBOX_DIR, name))
+        if entry is None:
+            continue
+        if entry.get("done") or entry.get("dead"):
+            done.append(entry)
+        elif time.time() - entry.get("created", 0) > max_age:
+            print(f"  WARNING: dropping undelivered brief {entry['id']} from the outbox "
+                  f"({entry['sent']}/{len(entry['chunks'])} chunks sent): {entry.get('error', '')}")
+            _remove(entry)
+        else:
+            entries.append(entry)
+    for entry in sorted(done, key=lambda e: e["created"])[:max(0, len(done) - OUTBOX_KEEP)]:
+        _remove(entry)
+    return sorted(entries, key=lambda e: e["created"])
+
+
+def _kill(entry: dict, reason: str) -> None:
+    entry["dead"] = True
+    entry["error"] = reason
+    _save(entry)
+
+
+def _remove(entry: dict) -> None:
+    try:
+        os.remove(_path(entry["id"]))
+    except OSError:
+        pass
+
+
+def send(entry: dict, token: str, deadline: float = None) -> bool:
+    """
+    Send the entry's chunks from the first unsent one, recording progress after
+    each. On failure the next retry is scheduled with backoff and False returned;
+    a permanent refusal marks the entry dead instead.
+    """
+    chunks = entry["chunks"]
+    while entry["sent"] < len(chunks):
+        index = entry["sent"]
+        error, status = "", None
+        try:
+            r = telegram_delivery.send_chunk(token, entry["chat_id"], chunks[index], deadline=deadline)
+            status = getattr(r, "status_code", None)
+            if status != 200:
+                error = f"Telegram {status or '?'} | {getattr(r, 'text', '')}"
+        except Exception as e:
+            error = f"Telegram exception: {e}"
+        if error and status is not None and 400 <= status < 500 and status != 429:
+            # send_chunk already retried a Markdown rejection as plain text.
+            _kill(entry, error)
+            print(f"ERROR: Telegram refused chunk {chunk_key(entry, index)}, dropping the brief: {error}")
+            return False
+        if error:
+            entry["attempts"] += 1
+            entry["error"] = error
+            entry["next_try"] = time.time() + min(OUTBOX_MAX_BACKOFF, OUTBOX_BACKOFF * 2 ** (entry["attempts"] - 1))
+            _save(entry)
+            print(f"ERROR: chunk {chunk_key(entry, index)} not delivered "
+                  f"(attempt {entry['attempts']}): {error}")
+            return False
+        entry["sent"] = index + 1
+        entry["error"] = ""
+        if entry["sent"] < len(chunks):
+            _save(entry)
+    entry["done"] = True
+    entry["delivered"] = time.time()
+    _save(entry)
+    return True
+
+
+def drain(token: str, deadline: float = None, entries: list = None) -> list:
+    """
+    Retry pending entries (default: the whole outbox) as their backoff allows,
+    until all are delivered or the next retry would start past `deadline`
+    (a time.monotonic() value; default OUTBOX_RETRY_WINDOW from now).
+    Returns the entries delivered.
+    """
+    if deadline is None:
+        deadline = time.monotonic() + OUTBOX_RETRY_WINDOW
+    waiting = [e for e in (pending() if entries is None else entries) if not (e["done"] or e.get("dead"))]
+    delivered = []
+    while waiting:
+        now = time.time()
+        for entry in [e for e in waiting if e["next_try"] <= now]:
+            if send(entry, token, deadline):
+                delivered.append(entry)
+            if entry["done"] or entry.get("dead"):
+                waiting.remove(entry)
+        if not waiting:
+            break
+        wait = min(e["next_try"] for e in waiting) - time.time()
+        if time.monotonic() + max(0.0, wait) >= deadline:
+            break
+        time.sleep(max(0.0, wait))
+    return delivered
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Relevance ranking of candidate articles.
+Each article is a hashed TF-IDF vector over its title (counted twice) and
+summary; its score is the cosine-style weight against SEED_TERMS, plus a small
+base so recency still orders unrelated stories, times an exponential recency
+decay. Everything is computed on sparse (row, bucket) pairs with NumPy, so cost
+is linear in the total number of tokens.
+"""
+
+import os
+import re
+import time
+import zlib
+
+np = None   # NumPy, imported by available() on first use to keep cold starts short
+
+RANK_HALF_LIFE_HOURS = float(os.getenv("RANK_HALF_LIFE_HOURS", "12"))
+RANK_UNKNOWN_AGE     = 24.0   # hours assumed for items without a date
+RELEVANCE_BASE       = 0.05
+HASH_DIM             = 1 << 16
+
+# What matters to Rezi: the telescope shop, e-commerce and the Georgian market.
+SEED_TERMS = {
+    "telescope": 3.0, "telescopes": 3.0, "astronomy": 2.5, "stargazing": 2.5, "observatory": 2.0,
+    "eclipse": 2.0, "meteor": 2.0, "comet": 2.0, "planet": 1.5, "nasa": 1.5, "spacex": 1.5,
+    "jwst": 2.0, "webb": 2.0, "optics": 2.0, "binoculars": 2.5,
+    "e-commerce": 2.5, "ecommerce": 2.5, "retail": 2.0, "shopify": 2.0, "marketplace": 1.5,
+    "checkout": 1.5, "payments": 1.5, "conversion": 1.5, "delivery": 1.0, "amazon": 1.5,
+    "startup": 1.0, "ai": 1.5, "openai": 1.5, "bitcoin": 1.5, "ethereum": 1.0, "regulation": 1.0,
+    "georgia": 2.5, "georgian": 2.5, "tbilisi": 3.0, "batumi": 2.0, "lari": 2.5, "gel": 1.5,
+    "საქართველო": 2.5, "საქართველოს": 2.5, "თბილისი": 3.0, "ლარი": 2.5, "ბიზნესი": 1.5,
+    "ექსპორტი": 1.5, "ინვესტიციები": 1.5, "ბანკი": 1.0,
+}
+
+_TOKEN_RE = re.compile(r"\w+(?:-\w+)*")
+
+
+def available() -> bool:
+    """Import NumPy if not done yet; False when it is not installed."""
+    global np
+    if np is None:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:  # ranking is optional; callers fall back to feed order
+            np = False
+    return np is not False
+
+
+_BUCKETS = {}
+
+
+def _bucket(token: str) -> int:
+    bucket = _BUCKETS.get(token)
+    if bucket is None:
+        if len(_BUCKETS) > 500_000:
+            _BUCKETS.clear()
+        bucket = _BUCKETS[token] = zlib.crc32(token.encode("utf-8")) % HASH_DIM
+    return bucket
+
+
+_SEED_WEIGHTS = None
+
+
+def _seed_weights():
+    global _SEED_WEIGHTS
+    if _SEED_WEIGHTS is None:
+        w = np.zeros(HASH_DIM, dtype=np.float64)
+        for term, weight in SEED_TERMS.items():
+            w[_bucket(term.casefold())] = max(w[_bucket(term.casefold())], weight)
+        _SEED_WEIGHTS = w
+    return _SEED_WEIGHTS
+
+
+def tfidf(texts: list) -> tuple:
+    """
+    Hashed TF-IDF of texts as sparse (rows, buckets, weights) arrays, plus each
+    row's L2 norm. Needs NumPy (see available()).
+    """
+    available()
+    n = len(texts)
+    tokens = [_TOKEN_RE.findall(text.casefold()) for text in texts]
+    lengths = [len(t) for t in tokens]
+    total = sum(lengths)
+    cols = np.fromiter((_bucket(t) for toks in tokens for t in toks), dtype=np.int64, count=total)
+    rows = np.repeat(np.arange(n, dtype=np.int64), lengths)
+    pairs, tf = np.unique(rows * HASH_DIM + cols, return_counts=True)
+    r, c = pairs // HASH_DIM, pairs % HASH_DIM
+    df = np.bincount(c, minlength=HASH_DIM)
+    x = tf * (np.log((1 + n) / (1 + df[c])) + 1.0)
+    norms = np.sqrt(np.bincount(r, weights=x * x, minlength=n))
+    return r, c, x, norms
+
+
+def vectors(texts: list):
+    """Row-normalized dense TF-IDF matrix of texts, over just the buckets they use."""
+    r, c, x, norms = tfidf(texts)
+    used, col = np.unique(c, return_inverse=True)
+    m = np.zeros((len(texts), len(used)))
+    m[r, col] = x
+    return np.divide(m, norms[:, None], out=np.zeros_like(m), where=norms[:, None] > 0)
+
+
+def scores(articles: list, now: float = None):
+    """Score array aligned with `articles` (higher is better)."""
+    now = time.time() if now is None else now
+    n = len(articles)
+    r, c, x, norms = tfidf([f"{a.get('title', '')} {a.get('title', '')} {a.get('summary', '')}" for a in articles])
+    weighted = np.bincount(r, weights=x * _seed_weights()[c], minlength=n)
+    relevance = np.divide(weighted, norms, out=np.zeros(n), where=norms > 0)
+
+    published = np.array([a.get("published") or np.nan for a in articles], dtype=np.float64)
+    age_hours = np.where(np.isnan(published), RANK_UNKNOWN_AGE, np.maximum(0.0, (now - published) / 3600))
+    decay = 0.5 ** (age_hours / RANK_HALF_LIFE_HOURS)
+    return (RELEVANCE_BASE + relevance) * decay
+
+
+def rank(articles: list, top_n: int = None, now: float = None) -> list:
+    """Articles sorted by score (stable, so ties keep feed order), cut to top_n."""
+    if len(articles) < 2 or not available():
+        return articles[:top_n]
+    order = np.argsort(-scores(articles, now), kind="stable")
+    return [articles[i] for i in order[:top_n]]
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Broadcast recipients: the chat ids a brief is fanned out to besides the main chat.
+Kept apart from broadcast.py so a run without recipients never imports asyncio.
+"""
+
+import os
+
+TELEGRAM_RECIPIENTS      = os.getenv("TELEGRAM_RECIPIENTS", "")       # comma/space separated chat ids
+TELEGRAM_RECIPIENTS_FILE = os.getenv("TELEGRAM_RECIPIENTS_FILE", "")  # one chat id per line, # comments
+
+
+def load_recipients() -> list:
+    """Chat ids from TELEGRAM_RECIPIENTS and TELEGRAM_RECIPIENTS_FILE, deduplicated in order."""
+    raw = TELEGRAM_RECIPIENTS.replace(",", " ").split()
+    if TELEGRAM_RECIPIENTS_FILE:
+        try:
+            with open(TELEGRAM_RECIPIENTS_FILE, encoding="utf-8") as f:
+                for line in f:
+                    line = line.split("#", 1)[0].strip()
+                    if line:
+                        raw.append(line)
+        except OSError as e:
+            print(f"  WARNING: cannot read recipients file: {e}")
+    return list(dict.fromkeys(raw))
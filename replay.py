@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Record-and-replay of every upstream HTTP exchange of a run.
+--record PATH mounts a RecordingAdapter on the shared session: each response
+(feeds, BM.ge, NewsAPI, OpenAI, Telegram) is stored with its request, status,
+headers, body and latency, and the lot is written to one gzip'd JSON archive.
+--replay PATH mounts a ReplayAdapter that answers the same requests from the
+archive without touching the network, optionally at the recorded latencies.
+Both run in a scratch cache dir (morning_briefing.run_isolated): a recording
+then holds every request the run needs, however warm the real cache is, and a
+replay leaves the real seen index, outbox, schedule and feed health untouched.
+Credentials (the Telegram bot token, NewsAPI key, Authorization headers) are
+never written to the archive.
+"""
+
+import io
+import re
+import gzip
+import json
+import time
+import sys
+import base64
+import threading
+from collections import defaultdict, deque
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from urllib3.response import HTTPResponse
+
+import http_client
+
+ARCHIVE_VERSION = 1
+
+_SECRET_PARAMS = {"apikey", "api_key", "key", "token", "access_token"}
+_BOT_TOKEN_RE = re.compile(r"/bot[^/]+/")
+# Headers that describe the recorded (already decoded) body no longer apply to it.
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+
+
+def redact_url(url: str) -> str:
+    """The URL with the bot token and any credential query parameters blanked."""
+    parts = urlsplit(url)
+    path = _BOT_TOKEN_RE.sub("/bot<redacted>/", parts.path)
+    query = urlencode([(k, "<redacted>" if k.lower() in _SECRET_PARAMS else v)
+                       for k, v in parse_qsl(parts.query, keep_blank_values=True)])
+    return urlunsplit((parts.scheme, parts.netloc, path, query, ""))
+
+
+def _encode_body(data: bytes) -> dict:
+    try:
+        return {"body": data.decode("utf-8"), "encoding": "utf-8"}
+    except UnicodeDecodeError:
+        return {"body": base64.b64encode(data).decode("ascii"), "encoding": "base64"}
+
+
+def _decode_body(entry: dict) -> bytes:
+    if entry.get("encoding") == "base64":
+        return base64.b64decode(entry["body"])
+    return entry.get("body", "").encode("utf-8")
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Sends requests as usual and keeps a copy of every exchange."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.started = time.monotonic()
+        self.exchanges = []
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        started = time.monotonic()
+        try:
+            response = super().send(request, **kwargs)
+            body = response.content   # read now, so the archive holds the whole body
+        except Exception as e:
+            self._add(request, started, error=f"{type(e).__name__}: {e}")
+            raise
+        self._add(request, started, status=response.status_code,
+                  headers={k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS},
+                  **_encode_body(body))
+        return response
+
+    def _add(self, request, started: float, **response) -> None:
+        entry = {
+            "method": request.method,
+            "url": redact_url(request.url),
+            "request": _encode_body(request.body if isinstance(request.body, bytes)
+                                    else (request.body or "").encode("utf-8"))["body"],
+            "offset": round(started - self.started, 4),
+            "seconds": round(time.monotonic() - started, 4),
+            **response,
+        }
+        with self._lock:
+            self.exchanges.append(entry)
+
+    def save(self, path: str) -> None:
+        archive = {"version": ARCHIVE_VERSION, "recorded": time.time(), "argv": sys.argv[1:],
+                   "exchanges": self.exchanges}
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(archive, f, ensure_ascii=False)
+        print(f"🎙️ Recorded {len(self.exchanges)} HTTP exchanges to {path}")
+
+
+class ReplayAdapter(HTTPAdapter):
+    """
+    Answers requests from an archive. Exchanges for the same method and URL are
+    replayed in recorded order; once they run out the last one is repeated.
+    A request that was never recorded fails like an unreachable host.
+    """
+
+    def __init__(self, path: str, latency: bool = False, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            archive = json.load(f)
+        self.latency = latency
+        self.misses = 0
+        self._queues = defaultdict(deque)
+        self._last = {}
+        self._lock = threading.Lock()
+        for entry in archive["exchanges"]:
+            self._queues[(entry["method"], entry["url"])].append(entry)
+        print(f"▶️ Replaying {len(archive['exchanges'])} HTTP exchanges from {path}")
+
+    def _next(self, key: tuple):
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                self._last[key] = queue.popleft()
+            return self._last.get(key)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        url = redact_url(request.url)
+        entry = self._next((request.method, url))
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            raise RequestsConnectionError(f"not in the replay archive: {request.method} {url}", request=request)
+        if self.latency:
+            time.sleep(entry["seconds"])
+        if "error" in entry:
+            raise RequestsConnectionError(f"recorded failure: {entry['error']}", request=request)
+
+        raw = HTTPResponse(
+            body=io.BytesIO(_decode_body(entry)),
+            headers=entry.get("headers", {}),
+            status=entry["status"],
+            preload_content=False,
+            decode_content=False,
+        )
+        return self.build_response(request, raw)
+
+
+_recorder = None
+
+
+def start_recording() -> RecordingAdapter:
+    global _recorder
+    _recorder = http_client.build_adapter(RecordingAdapter)
+    http_client.mount(_recorder)
+    return _recorder
+
+
+def save_recording(path: str) -> None:
+    if _recorder is not None:
+        try:
+            _recorder.save(path)
+        except OSError as e:
+            print(f"  WARNING: cannot write replay archive: {e}")
+
+
+def start_replay(path: str, latency: bool = False) -> ReplayAdapter:
+    adapter = ReplayAdapter(path, latency)
+    http_client.mount(adapter)
+    return adapter
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Single entry point for every brief job.
+
+  python rezi_brief.py run          full run now: fetch, summarize, send
+  python rezi_brief.py prefetch     collect feeds into a snapshot
+  python rezi_brief.py precompute   summarize the newest snapshot
+  python rezi_brief.py send         send the precomputed snapshot
+  python rezi_brief.py daemon       stay resident (trigger / status talk to it)
+  python rezi_brief.py pipeline     every variant from one fetch (brief_pipeline.py)
+  python rezi_brief.py english      the English briefing alone
+  python rezi_brief.py bench        offline benchmarks (bench/run_bench.py)
+
+Options after the command go to the job (e.g. `run --record run.json.gz`,
+`bench --iterations 3`). Nothing heavier than the standard library is imported
+until a command is chosen, and then only what that command needs.
+With --importtime the command runs under `python -X importtime` and a summary
+of the slowest imports is printed at the end, to keep cold starts on short-lived
+runners in check.
+"""
+
+import os
+import sys
+import argparse
+import importlib
+import subprocess
+
+IMPORTTIME_TOP = 15
+
+# command: (module, flags passed to its main(), help)
+COMMANDS = {
+    "run":        ("morning_briefing", [], "fetch, summarize and send the brief now"),
+    "prefetch":   ("morning_briefing", ["--prefetch"], "collect feeds into a snapshot without sending"),
+    "precompute": ("morning_briefing", ["--precompute"], "summarize the newest snapshot ahead of the send"),
+    "send":       ("morning_briefing", ["--send"], "send the newest precomputed snapshot (full run if none)"),
+    "daemon":     ("morning_briefing", ["--daemon"], "stay resident and run at DAEMON_SCHEDULE times"),
+    "trigger":    ("brief_daemon", ["run"], "ask a running daemon to send the brief now"),
+    "status":     ("brief_daemon", ["status"], "print a running daemon's status"),
+    "pipeline":   ("brief_pipeline", [], "render every brief variant from one fetch"),
+    "english":    ("english_daily_briefing", [], "send the English briefing"),
+    "bench":      ("bench.run_bench", [], "benchmark the pipeline against a local stub server"),
+}
+
+
+def dispatch(command: str, args: list) -> None:
+    module, flags, _ = COMMANDS[command]
+    if module == "brief_daemon":
+        import brief_daemon
+        try:
+            print(brief_daemon.send_command(flags[0]))
+        except OSError as e:
+            sys.exit(f"ERROR: no brief daemon is listening on {brief_daemon.DAEMON_SOCKET}: {e}")
+        return
+    main = importlib.import_module(module).main
+    sys.argv = [f"{os.path.basename(sys.argv[0])} {command}", *flags, *args]
+    main()
+
+
+# ── Import-time report ────────────────────────────────────────────────────────
+def run_with_importtime(argv: list) -> int:
+    """Run this CLI again under -X importtime, pass its other stderr through, then summarize."""
+    proc = subprocess.Popen([sys.executable, "-X", "importtime", os.path.abspath(__file__), *argv],
+                            stderr=subprocess.PIPE, text=True, errors="replace")
+    imports = []
+    for line in proc.stderr:
+        if not line.startswith("import time:"):
+            sys.stderr.write(line)
+            continue
+        fields = line[len("import time:"):].split("|")
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except (ValueError, IndexError):
+            continue   # the header line
+        name = fields[2].rstrip("\n")
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        imports.append((name.strip(), depth, self_us, cumulative_us))
+    code = proc.wait()
+    print_importtime(imports)
+    return code
+
+
+def print_importtime(imports: list, top: int = IMPORTTIME_TOP) -> None:
+    if not imports:
+        return
+    total = sum(cumulative for _, depth, _, cumulative in imports if depth == 0)
+    print(f"\n📦 Imports: {total / 1000:.1f} ms across {len(imports)} modules")
+    print(f"  {'module':<40}{'self':>10}{'cumulative':>12}")
+    for name, depth, self_us, cumulative_us in sorted(imports, key=lambda i: -i[3])[:top]:
+        label = "  " * min(depth, 4) + name
+        print(f"  {label[:40]:<40}{self_us / 1000:>8.1f}ms{cumulative_us / 1000:>10.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="rezi_brief.py", description="Rezi Morning Brief",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="\n".join(f"  {name:<12}{help_text}" for name, (_, _, help_text) in COMMANDS.items()))
+    parser.add_argument("--importtime", action="store_true",
+                        help="report which imports the command spent its start-up on")
+    parser.add_argument("command", choices=COMMANDS, metavar="command")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="options for the command")
+    args = parser.parse_args()
+
+    if args.importtime:
+        sys.exit(run_with_importtime([args.command, *args.args]))
+    dispatch(args.command, args.args)
+
+
+if __name__ == "__main__":
+    main()
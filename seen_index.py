@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Persistent index of already-delivered articles (SQLite, under the cache dir).
+Articles are keyed by a hash of their normalized link and of their normalized
+title, so the same story is recognised even when its summary text changes.
+"""
+
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+from cache import CACHE_DIR
+
+SEEN_DB       = os.getenv("SEEN_DB", os.path.join(CACHE_DIR, "seen.sqlite3"))
+SEEN_TTL_DAYS = float(os.getenv("SEEN_TTL_DAYS", "14"))
+
+
+def normalize_link(link: str) -> str:
+    """Strip scheme, www., tracking params, fragment and trailing slash."""
+    parts = urlsplit(link.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = [(k, v) for k, v in parse_qsl(parts.query) if not k.lower().startswith("utm_")]
+    path = parts.path.rstrip("/")
+    return f"{host}{path}" + (f"?{urlencode(sorted(query))}" if query else "")
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(re.findall(r"\w+", title.casefold()))
+
+
+def article_keys(article: dict) -> list:
+    """Hash keys identifying an article: one for the link, one for the title."""
+    keys = []
+    if article.get("link"):
+        keys.append("l:" + normalize_link(article["link"]))
+    if article.get("title"):
+        keys.append("t:" + normalize_title(article["title"]))
+    return [hashlib.sha1(k.encode("utf-8")).hexdigest()[:20] for k in keys]
+
+
+class SeenIndex:
+    """Set of delivered article keys with time-based expiry."""
+
+    def __init__(self, path: str = SEEN_DB, ttl_days: float = SEEN_TTL_DAYS):
+        self.ttl = ttl_days * 86400
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute("CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY, ts REAL)")
+            self._db.execute("DELETE FROM seen WHERE ts < ?", (time.time() - self.ttl,))
+        self._keys = {row[0] for row in self._db.execute("SELECT key FROM seen")}
+
+    def seen(self, article: dict) -> bool:
+        return any(k in self._keys for k in article_keys(article))
+
+    def mark(self, articles: list) -> None:
+        now = time.time()
+        rows = [(k, now) for a in articles for k in article_keys(a)]
+        with self._lock, self._db:
+            self._db.executemany("INSERT OR REPLACE INTO seen (key, ts) VALUES (?, ?)", rows)
+            self._keys.update(k for k, _ in rows)
+
+    def close(self) -> None:
+        self._db.close()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Snapshot store for the prefetch stage.
+Each snapshot holds the normalized articles per sector and, once precomputed,
+the AI digest for exactly those articles. The send step only reads the newest one.
+"""
+
+import os
+import json
+import time
+import hashlib
+
+from cache import CACHE_DIR
+from seen_index import article_keys
+
+SNAPSHOT_DIR     = os.getenv("SNAPSHOT_DIR", os.path.join(CACHE_DIR, "snapshots"))
+SNAPSHOT_MAX_AGE = float(os.getenv("SNAPSHOT_MAX_AGE", str(6 * 3600)))
+SNAPSHOT_KEEP    = int(os.getenv("SNAPSHOT_KEEP", "10"))
+
+
+def news_hash(all_news: dict) -> str:
+    blob = json.dumps(all_news, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def save_snapshot(all_news: dict, digest: str = None) -> str:
+    """Write a new snapshot and prune all but the newest SNAPSHOT_KEEP."""
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    now = time.time()
+    snapshot = {
+        "created": now,
+        "news": all_news,
+        "news_hash": news_hash(all_news),
+        "digest": digest,
+    }
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f"{now % 1:.3f}"[1:]
+    path = os.path.join(SNAPSHOT_DIR, f"snapshot-{stamp}.json")
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+
+    for old in _snapshot_files()[:-SNAPSHOT_KEEP]:
+        os.remove(old)
+    return path
+
+
+def latest_snapshot(max_age: float = SNAPSHOT_MAX_AGE):
+    """The newest snapshot younger than max_age, or None."""
+    for path in reversed(_snapshot_files()):
+        try:
+            with open(path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if time.time() - snapshot.get("created", 0) <= max_age:
+            return snapshot
+        return None
+    return None
+
+
+def merge_news(newer: dict, older: dict, limit: int) -> dict:
+    """Per sector: the newer articles first, topped up from the older ones, deduplicated."""
+    merged = {}
+    for sector in list(newer) + [s for s in older if s not in newer]:
+        taken, articles = set(), []
+        for a in newer.get(sector, []) + older.get(sector, []):
+            keys = article_keys(a)
+            if taken.intersection(keys):
+                continue
+            taken.update(keys)
+            articles.append(a)
+        merged[sector] = articles[:limit]
+    return merged
+
+
+def _snapshot_files() -> list:
+    try:
+        names = sorted(n for n in os.listdir(SNAPSHOT_DIR) if n.startswith("snapshot-") and n.endswith(".json"))
+    except OSError:
+        return []
+    return [os.path.join(SNAPSHOT_DIR, n) for n in names]
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Telegram delivery: Markdown-safe chunking, rate limiting and 429 handling.
+
+- Messages are split on paragraph/line/word boundaries, never inside a *bold*,
+  _italic_, `code` or [title](link) span, and measured in UTF-16 code units the
+  way Telegram counts its 4096-character limit (emoji count double).
+- Every API call passes a global token bucket (~30 msg/s per bot) and a per-chat
+  one (~1 msg/s with a small burst) before it goes out.
+- 429 replies are retried after the server's retry_after; a chunk rejected for
+  bad entities is resent as plain text instead of aborting the rest.
+"""
+
+import os
+import time
+import bisect
+import threading
+
+import http_client
+import metrics
+
+TELEGRAM_LIMIT       = 4096
+TELEGRAM_GLOBAL_RATE = float(os.getenv("TELEGRAM_GLOBAL_RATE", "30"))
+TELEGRAM_CHAT_RATE   = float(os.getenv("TELEGRAM_CHAT_RATE", "1"))
+TELEGRAM_CHAT_BURST  = int(os.getenv("TELEGRAM_CHAT_BURST", "3"))
+TELEGRAM_MAX_RETRIES = int(os.getenv("TELEGRAM_MAX_RETRIES", "4"))
+MIN_CALL_TIMEOUT     = 5.0   # a call started at or past its deadline still gets this long
+
+
+# ── Chunking ──────────────────────────────────────────────────────────────────
+def tg_len(text: str) -> int:
+    """Length as Telegram counts it: UTF-16 code units."""
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _entity_spans(text: str) -> list:
+    """(start, end) spans of legacy-Markdown entities; unmatched markers are literal."""
+    spans = []
+    i, n = 0, len(text)
+    while i < n:
+        ch = text[i]
+        if ch == "\\":
+            i += 2
+            continue
+        end = -1
+        if text.startswith("```", i):
+            close = text.find("```", i + 3)
+            end = close + 3 if close != -1 else -1
+        elif ch in "*_`":
+            close = text.find(ch, i + 1)
+            end = close + 1 if close != -1 else -1
+        elif ch == "[":
+            mid = text.find("](", i + 1)
+            close = text.find(")", mid + 2) if mid != -1 else -1
+            end = close + 1 if close != -1 else -1
+        if end > 0:
+            spans.append((i, end))
+            i = end
+        else:
+            i += 1
+    return spans
+
+
+def split_message(text: str, limit: int = TELEGRAM_LIMIT) -> list:
+    """Split text into chunks of at most `limit` UTF-16 units without breaking entities."""
+    text = text.strip()
+    if tg_len(text) <= limit:
+        return [text] if text else []
+
+    units = [0]
+    for ch in text:
+        units.append(units[-1] + (2 if ord(ch) > 0xFFFF else 1))
+    inside = bytearray(len(text) + 1)
+    for start, end in _entity_spans(text):
+        inside[start + 1:end] = b"\x01" * (end - start - 1)
+
+    chunks = []
+    pos = 0
+    while pos < len(text):
+        hard = bisect.bisect_right(units, units[pos] + limit) - 1
+        if hard >= len(text):
+            chunks.append(text[pos:])
+            break
+        cut = _best_break(text, inside, pos, hard)
+        chunk = text[pos:cut].rstrip()
+        if chunk:
+            chunks.append(chunk)
+        pos = cut
+        while pos < len(text) and text[pos] in " \n":
+            pos += 1
+    return chunks
+
+
+def _best_break(text: str, inside: bytearray, lo: int, hi: int) -> int:
+    for sep in ("\n\n", "\n", " "):
+        at = text.rfind(sep, lo + 1, hi)
+        while at > lo and inside[at]:
+            at = text.rfind(sep, lo + 1, at)
+        if at > lo:
+            return at
+    for at in range(hi, lo, -1):
+        if not inside[at]:
+            return at
+    return hi
+
+
+# ── Rate limiting ─────────────────────────────────────────────────────────────
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+_GLOBAL_BUCKET = TokenBucket(TELEGRAM_GLOBAL_RATE, int(TELEGRAM_GLOBAL_RATE))
+_CHAT_BUCKETS = {}
+_CHAT_LOCK = threading.Lock()
+
+
+def _chat_bucket(chat_id) -> TokenBucket:
+    with _CHAT_LOCK:
+        bucket = _CHAT_BUCKETS.get(str(chat_id))
+        if bucket is None:
+            bucket = _CHAT_BUCKETS[str(chat_id)] = TokenBucket(TELEGRAM_CHAT_RATE, TELEGRAM_CHAT_BURST)
+        return bucket
+
+
+# ── API calls ─────────────────────────────────────────────────────────────────
+def call(token: str, method: str, payload: dict, timeout: float = 15, deadline: float = None):
+    """
+    POST a Bot API method under the rate limits, retrying 429s and transient errors.
+    With a deadline (time.monotonic() value), no retry or wait is started past it
+    and the request timeout shrinks to fit, down to MIN_CALL_TIMEOUT for the first try.
+    """
+    with metrics.span(f"telegram:{method}", bytes=len(payload.get("text", "").encode("utf-8"))) as span:
+        r = _call(token, method, payload, timeout, deadline, span)
+        span["http"] = getattr(r, "status_code", None)
+        if r is None or r.status_code != 200:
+            span["status"] = "error"
+        return r
+
+
+def _call(token: str, method: str, payload: dict, timeout: float, deadline: float, span: dict):
+    url = f"https://api.telegram.org/bot{token}/{method}"
+    r = None
+    for attempt in range(TELEGRAM_MAX_RETRIES + 1):
+        span["retries"] = attempt
+        if deadline is not None:
+            left = deadline - time.monotonic()
+            if attempt and left <= 0:
+                break
+            timeout = max(MIN_CALL_TIMEOUT, min(timeout, left))
+        _chat_bucket(payload.get("chat_id")).acquire()
+        _GLOBAL_BUCKET.acquire()
+        try:
+            r = http_client.post(url, json=payload, timeout=timeout)
+        except Exception as e:
+            if attempt == TELEGRAM_MAX_RETRIES or not _can_wait(2 ** attempt, deadline):
+                raise
+            print(f"  WARNING: Telegram {method} exception, retrying: {e}")
+            time.sleep(2 ** attempt)
+            continue
+        if r.status_code == 429:
+            try:
+                retry_after = float(r.json().get("parameters", {}).get("retry_after", 1))
+            except ValueError:
+                retry_after = 1.0
+            if not _can_wait(retry_after, deadline):
+                return r
+            print(f"  Telegram rate limit hit, waiting {retry_after:.0f}s")
+            time.sleep(retry_after)
+            continue
+        if r.status_code >= 500 and attempt < TELEGRAM_MAX_RETRIES and _can_wait(2 ** attempt, deadline):
+            time.sleep(2 ** attempt)
+            continue
+        return r
+    return r
+
+
+def _can_wait(seconds: float, deadline: float = None) -> bool:
+    return deadline is None or time.monotonic() + seconds < deadline
+
+
+def send_chunk(token: str, chat_id, text: str, parse_mode: str = "Markdown", deadline: float = None):
+    """Send one chunk; if Telegram rejects its entities, resend it as plain text."""
+    payload = {"chat_id": chat_id, "text": text, "disable_web_page_preview": True}
+    if parse_mode:
+        payload["parse_mode"] = parse_mode
+    r = call(token, "sendMessage", payload, deadline=deadline)
+    if parse_mode and r is not None and r.status_code == 400 and "parse entities" in r.text:
+        print("  WARNING: Telegram rejected Markdown, resending chunk as plain text")
+        del payload["parse_mode"]
+        r = call(token, "sendMessage", payload, deadline=deadline)
+    return r
+
+
+def send_message(token: str, chat_id, message: str, parse_mode: str = "Markdown",
+                 deadline: float = None) -> bool:
+    """Split and send a message; returns True once every chunk is delivered."""
+    for chunk in split_message(message):
+        try:
+            r = send_chunk(token, chat_id, chunk, parse_mode, deadline)
+        except Exception as e:
+            print(f"ERROR: Telegram exception: {e}")
+            return False
+        if r is None or r.status_code != 200:
+            print(f"ERROR: Telegram {getattr(r, 'status_code', '?')} | {getattr(r, 'text', '')}")
+            return False
+    return True
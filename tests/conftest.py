@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# The brief modules are flat top-level files and read their configuration at
+# import time, so the repository root goes on the path and every cache is
+# pointed at a scratch directory before any of them is imported.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ["BRIEF_CACHE_DIR"] = tempfile.mkdtemp(prefix="brief-tests-")
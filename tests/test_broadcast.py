@@ -0,0 +1,31 @@
+import threading
+import time
+
+import broadcast
+import telegram_delivery
+
+
+class Reply:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        self.text = "" if status_code == 200 else "blocked"
+
+
+def test_fan_out_uses_the_configured_concurrency(monkeypatch):
+    lock = threading.Lock()
+    active, peak = [0], [0]
+
+    def send_chunk(token, chat_id, text, *args, **kwargs):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return Reply(403 if chat_id == "13" else 200)
+
+    monkeypatch.setattr(telegram_delivery, "send_chunk", send_chunk)
+    results = broadcast.broadcast("token", "hello", [str(i) for i in range(40)])
+    assert peak[0] == broadcast.BROADCAST_CONCURRENCY
+    assert [r["chat_id"] for r in results if not r["ok"]] == ["13"]
+    assert len(results) == 40
@@ -0,0 +1,37 @@
+import threading
+import time
+
+from budget import Budget, DaemonPool
+
+
+def test_allot_leaves_the_reserve():
+    budget = Budget(10)
+    assert budget.allot(20) <= 10
+    assert 3.9 < budget.allot(20, reserve=6) <= 4
+    assert budget.allot(2, reserve=6) == 2
+    assert budget.allot(5, reserve=30) == 0
+
+
+def test_zero_budget_is_unbounded():
+    budget = Budget(0)
+    assert budget.deadline is None
+    assert budget.allot(12, reserve=100) == 12
+
+
+def test_daemon_pool_runs_work_on_daemon_threads():
+    pool = DaemonPool(2)
+    futures = [pool.submit(lambda x: (x * 2, threading.current_thread().daemon), i) for i in range(5)]
+    assert [f.result(timeout=1) for f in futures] == [(i * 2, True) for i in range(5)]
+    pool.shutdown()
+
+
+def test_shutdown_cancels_queued_work():
+    pool = DaemonPool(1)
+    release = threading.Event()
+    running = pool.submit(release.wait)
+    queued = pool.submit(time.sleep, 0)
+    time.sleep(0.05)
+    pool.shutdown()
+    assert queued.cancelled()
+    release.set()
+    assert running.result(timeout=1) is True
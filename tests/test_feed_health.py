@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+import feed_health
+import http_cache
+import http_client
+from feed_health import FeedHealth, FeedUnavailable
+
+
+@pytest.fixture
+def health(tmp_path):
+    return FeedHealth(str(tmp_path / "health.json"))
+
+
+def fail_runs(health, key: str, runs: int, per_run: int = 1) -> None:
+    for _ in range(runs):
+        health.begin_run()
+        for _ in range(per_run):
+            health.record(key, False, 1.0)
+
+
+def test_breaker_opens_after_failing_runs(health):
+    fail_runs(health, "https://a/feed", feed_health.BREAKER_FAILURES - 1)
+    assert health.allow("https://a/feed")
+    fail_runs(health, "https://a/feed", 1)
+    assert not health.allow("https://a/feed")
+
+
+def test_one_failure_counts_per_run(health):
+    fail_runs(health, "https://a/feed", 1, per_run=feed_health.BREAKER_FAILURES + 2)
+    assert health.stats("https://a/feed")["consecutive_failures"] == 1
+    assert health.allow("https://a/feed")
+
+
+def test_probe_after_interval_and_success_closes(health, monkeypatch):
+    fail_runs(health, "https://a/feed", feed_health.BREAKER_FAILURES)
+    later = time.time() + feed_health.BREAKER_PROBE_INTERVAL + 1
+    monkeypatch.setattr(feed_health.time, "time", lambda: later)
+    assert health.allow("https://a/feed")
+    health.record("https://a/feed", True, 0.5)
+    assert health.stats("https://a/feed")["consecutive_failures"] == 0
+
+
+def test_timeout_fits_p95(health):
+    assert health.timeout_for("https://a/feed", 12) == 12   # too few samples
+    for latency in (1.0, 1.5, 2.0, 2.5, 3.0, 3.5):
+        health.record("https://a/feed", True, latency)
+    assert health.timeout_for("https://a/feed", 12) == 7.0
+    assert health.timeout_for("https://a/feed", 5) == 5
+
+
+def test_state_persists(health, tmp_path):
+    fail_runs(health, "https://a/feed", 1)
+    assert FeedHealth(str(tmp_path / "health.json")).stats("https://a/feed")["consecutive_failures"] == 1
+
+
+def test_health_key_separates_queries_and_hides_keys():
+    assert http_cache.health_key("https://a/feed") == "https://a/feed"
+    assert http_cache.health_key("https://n/api", {"q": "ai", "apiKey": "s"}) == "https://n/api?q=ai"
+    assert http_cache.health_key("https://n/api", {"q": "ai"}) != http_cache.health_key("https://n/api", {"q": "space"})
+
+
+def test_open_breaker_skips_the_request(health, monkeypatch):
+    monkeypatch.setattr(http_cache, "HEALTH", health)
+    requests = []
+
+    def get(url, **kwargs):
+        requests.append(kwargs["params"])
+        raise ConnectionError("down")
+
+    monkeypatch.setattr(http_client, "get", get)
+    fetch = lambda topic: http_cache.get_cached("https://n.example/api", lambda r: [], kind="news",
+                                                params={"q": topic}, fresh_for=0)
+    for _ in range(feed_health.BREAKER_FAILURES):
+        health.begin_run()
+        with pytest.raises(ConnectionError):
+            fetch("ai")
+    with pytest.raises(FeedUnavailable):
+        fetch("ai")
+    with pytest.raises(ConnectionError):
+        fetch("space")   # another query of the same URL has its own breaker
+    assert requests == [{"q": "ai"}] * feed_health.BREAKER_FAILURES + [{"q": "space"}]
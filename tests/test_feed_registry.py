@@ -0,0 +1,83 @@
+import pytest
+
+import cache
+import feed_registry
+from feed_registry import FeedScheduler
+
+NOW = 1_700_000_000.0
+
+
+def feed(url: str, priority: int = 1, interval: float = 3600) -> dict:
+    return {"sector": "Space", "url": url, "priority": priority, "interval": interval, "max_items": 5}
+
+
+@pytest.fixture
+def scheduler(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(feed_registry, "FEEDS_PER_RUN", 0)
+
+    def make(feeds):
+        return FeedScheduler(feeds, path=str(tmp_path / "schedule.json"))
+    return make
+
+
+def items(*links) -> list:
+    return [{"title": link, "link": f"https://example.com/{link}"} for link in links]
+
+
+def test_never_polled_feeds_are_due_by_priority(scheduler):
+    low, high = feed("https://a/low", priority=1), feed("https://a/high", priority=5)
+    assert scheduler([low, high]).due(NOW) == [high, low]
+
+
+def test_duplicate_urls_are_polled_once(scheduler):
+    assert len(scheduler([feed("https://a/x"), feed("https://a/x")]).due(NOW)) == 1
+
+
+def test_polled_feed_is_due_again_after_its_interval(scheduler):
+    f = feed("https://a/x")
+    s = scheduler([f])
+    s.record(f, items("1"), now=NOW)
+    assert s.due(NOW + 60) == []
+    assert s.due(NOW + 3600 * (1 - feed_registry.SCHEDULE_SLACK)) == [f]
+
+
+def test_feed_without_stored_items_stays_due(scheduler):
+    f = feed("https://a/x")
+    s = scheduler([f])
+    s.record(f, [], now=NOW)   # an empty poll counts as a failure
+    assert s.due(NOW + 60) == [f]
+
+
+def test_unchanged_feed_backs_off(scheduler):
+    f = feed("https://a/x")
+    s = scheduler([f])
+    s.record(f, items("1"), now=NOW)
+    s.record(f, items("1"), now=NOW)
+    assert s.interval(f) == 7200
+    assert s.due(NOW + 3600) == []
+    assert s.due(NOW + 7200) == [f]
+    s.record(f, items("1", "2"), now=NOW + 7200)
+    assert s.interval(f) == 3600
+
+
+def test_most_overdue_first_within_a_priority(scheduler):
+    a, b = feed("https://a/a"), feed("https://a/b")
+    s = scheduler([a, b])
+    s.record(a, items("1"), now=NOW)
+    s.record(b, items("2"), now=NOW - 3600)
+    assert s.due(NOW + 3600) == [b, a]
+
+
+def test_feeds_per_run_caps_the_due_list(scheduler, monkeypatch):
+    monkeypatch.setattr(feed_registry, "FEEDS_PER_RUN", 2)
+    feeds = [feed(f"https://a/{i}", priority=i) for i in range(5)]
+    assert [f["priority"] for f in scheduler(feeds).due(NOW)] == [4, 3]
+
+
+def test_schedule_survives_a_restart(scheduler):
+    f = feed("https://a/x")
+    s = scheduler([f])
+    s.record(f, items("1"), now=NOW)
+    s.save()
+    assert scheduler([f]).due(NOW + 60) == []
@@ -0,0 +1,109 @@
+import random
+import threading
+import time
+
+import pytest
+
+import cache
+import feed_registry
+import morning_briefing as mb
+
+
+def feed(sector: str, url: str) -> dict:
+    return {"sector": sector, "url": url, "priority": 1, "interval": 3600, "max_items": 5}
+
+
+TOPICS = ["comet", "lander", "budget", "merger", "chip", "vaccine", "harvest", "election", "tariff",
+          "drought", "rocket", "stadium", "museum", "ferry", "glacier", "opera", "bridge", "festival"]
+
+
+def items(url: str) -> list:
+    """Three stories with unrelated titles, so none collapses into another."""
+    return [{"title": " ".join(random.Random(f"{url}/{i}").sample(TOPICS, 6)), "link": f"{url}/{i}", "summary": ""}
+            for i in range(3)]
+
+
+@pytest.fixture
+def feeds(tmp_path, monkeypatch):
+    """Install feeds whose fetch takes latency[url] seconds; returns (latency, calls)."""
+    monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path))
+    scheduler = feed_registry.FeedScheduler
+    monkeypatch.setattr(feed_registry, "FeedScheduler",
+                        lambda feeds: scheduler(feeds, path=str(tmp_path / "schedule.json")))
+    latency, calls, lock = {}, [], threading.Lock()
+
+    def fetch_rss(url, max_items):
+        with lock:
+            calls.append(url)
+        time.sleep(latency.get(url, 0.0))
+        return items(url)
+
+    def install(registry):
+        monkeypatch.setattr(mb, "FEEDS", registry)
+        monkeypatch.setattr(mb, "SECTORS", feed_registry.by_sector(registry))
+        monkeypatch.setattr(mb, "fetch_rss", fetch_rss)
+        return latency, calls
+    return install
+
+
+def test_feeds_are_fetched_concurrently(feeds, monkeypatch):
+    monkeypatch.setattr(mb, "HEDGE_AFTER", 0)
+    latency, _ = feeds([feed(s, f"https://{s}.example/{i}") for s in ("a", "b") for i in range(4)])
+    latency.update({f"https://{s}.example/{i}": 0.2 for s in ("a", "b") for i in range(4)})
+    started = time.monotonic()
+    news = mb.get_all_news(deadline=5)
+    assert time.monotonic() - started < 0.6   # eight 0.2 s feeds, not 1.6 s
+    assert [len(articles) for articles in news.values()] == [3, 3]
+
+
+def test_slow_feed_is_cut_at_the_deadline(feeds, monkeypatch):
+    monkeypatch.setattr(mb, "HEDGE_AFTER", 0)
+    latency, _ = feeds([feed("a", "https://a.example/fast"), feed("b", "https://b.example/slow")])
+    latency["https://b.example/slow"] = 3.0
+    partial = set()
+    started = time.monotonic()
+    news = mb.get_all_news(deadline=0.3, partial=partial)
+    assert time.monotonic() - started < 1.0
+    assert len(news["a"]) == 3 and news["b"] == []
+    assert partial == {"b"}
+
+
+def test_slow_feed_gets_a_second_request(feeds, monkeypatch):
+    monkeypatch.setattr(mb, "HEDGE_AFTER", 0.1)
+    latency, calls = feeds([feed("a", "https://a.example/fast"), feed("a", "https://a.example/stuck")])
+    latency["https://a.example/stuck"] = 5.0
+    started = time.monotonic()
+    results = mb._fetch_hedged(mb.FEEDS, deadline=0.5)
+    assert time.monotonic() - started < 1.0
+    assert list(results) == ["https://a.example/fast"]
+    assert calls.count("https://a.example/stuck") == 2
+    assert calls.count("https://a.example/fast") == 1
+
+
+def test_hedged_copy_wins_when_it_answers_first(feeds, monkeypatch):
+    monkeypatch.setattr(mb, "HEDGE_AFTER", 0.1)
+    latency, calls = feeds([feed("a", "https://a.example/flaky")])
+    first = threading.Event()
+
+    def fetch_rss(url, max_items):
+        calls.append(url)
+        if not first.is_set():
+            first.set()
+            time.sleep(5.0)   # the first request hangs
+        return items(url)
+
+    monkeypatch.setattr(mb, "fetch_rss", fetch_rss)
+    started = time.monotonic()
+    results = mb._fetch_hedged(mb.FEEDS, deadline=3)
+    assert time.monotonic() - started < 1.0
+    assert results == {"https://a.example/flaky": items("https://a.example/flaky")}
+
+
+def test_failed_feed_is_retried_at_once(feeds, monkeypatch):
+    monkeypatch.setattr(mb, "HEDGE_AFTER", 10)
+    _, calls = feeds([feed("a", "https://a.example/blip")])
+    answers = [[], items("https://a.example/blip")]
+    monkeypatch.setattr(mb, "fetch_rss", lambda url, max_items: calls.append(url) or answers.pop(0))
+    results = mb._fetch_hedged(mb.FEEDS, deadline=3)
+    assert len(results["https://a.example/blip"]) == 3
+    assert len(calls) == 2
@@ -0,0 +1,50 @@
+import threading
+import time
+
+import pytest
+
+import morning_briefing as mb
+import telegram_delivery
+
+
+class Reply:
+    status_code = 200
+    text = ""
+
+    def json(self):
+        return {"result": {"message_id": 7}}
+
+
+@pytest.fixture
+def telegram(monkeypatch):
+    """Texts of the edits Telegram applied, in order; the first edit takes 0.2 s."""
+    edits = []
+
+    def call(token, method, payload, deadline=None):
+        if not edits:
+            time.sleep(0.2)
+        edits.append(payload["text"])
+        return Reply()
+
+    monkeypatch.setattr(telegram_delivery, "send_chunk", lambda *args, **kwargs: Reply())
+    monkeypatch.setattr(telegram_delivery, "call", call)
+    monkeypatch.setattr(mb, "TELEGRAM_EDIT_INTERVAL", 0)
+    return edits
+
+
+def test_edit_in_flight_lands_before_the_final_message(telegram):
+    live = mb.LiveMessage("header")
+    progress = threading.Thread(target=live.update, args=("header\n\npartial",))
+    progress.start()
+    time.sleep(0.05)   # the progress edit is now waiting on Telegram
+    assert live.finish("header\n\nfinal")
+    progress.join()
+    assert telegram == ["header\n\npartial", "header\n\nfinal"]
+
+
+def test_no_progress_edit_after_finish(telegram):
+    live = mb.LiveMessage("header")
+    assert live.finish("header\n\nfinal")
+    assert not live.update("header\n\nlate partial")
+    assert telegram == ["header\n\nfinal"]
+    assert live.text == "header\n\nfinal"
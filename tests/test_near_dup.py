@@ -0,0 +1,58 @@
+import near_dup
+
+GPT5 = {
+    "title": "OpenAI launches GPT-5 with improved reasoning and fewer hallucinations",
+    "link": "https://a.example/gpt5",
+    "summary": "OpenAI on Thursday released GPT-5, its newest flagship model, which the company says "
+               "reasons better, writes more reliable code and hallucinates far less than GPT-4o.",
+}
+GPT5_AGAIN = {
+    "title": "OpenAI's GPT-5 is here, and it's free for everyone",
+    "link": "https://b.example/gpt-5-is-here",
+    "summary": "OpenAI released GPT-5 on Thursday, its newest flagship model, which the company says "
+               "reasons better, writes more reliable code and hallucinates less than GPT-4o.",
+}
+BTC = {
+    "title": "Bitcoin tops $100,000 for the first time",
+    "link": "https://c.example/btc",
+    "summary": "Bitcoin rose above $100,000 on Wednesday for the first time ever, extending a rally "
+               "fuelled by spot ETF inflows and hopes of friendlier US regulation.",
+}
+BTC_AGAIN = {
+    "title": "BTC price hits six figures as ETF demand surges",
+    "link": "https://d.example/six-figures",
+    "summary": "Bitcoin climbed above $100,000 on Wednesday for the first time ever, extending a rally "
+               "fuelled by spot ETF inflows and hopes for friendlier US regulation.",
+}
+OPENAI_PRICING = {
+    "title": "OpenAI launches a new API pricing tier for startups",
+    "link": "https://e.example/pricing",
+    "summary": "The company announced discounted rates for early-stage companies using its models.",
+}
+
+
+def test_rephrased_headlines_of_one_story_cluster():
+    assert near_dup.clusters([GPT5, BTC, GPT5_AGAIN, BTC_AGAIN]) == [[0, 2], [1, 3]]
+
+
+def test_different_stories_on_one_topic_stay_apart():
+    assert near_dup.clusters([GPT5, OPENAI_PRICING]) == [[0], [1]]
+
+
+def test_shingles_cover_title_and_summary():
+    tokens = near_dup.shingles({"title": "Bitcoin tops record", "summary": "Traders cheer the rally."})
+    assert {"bitcoin tops", "record traders", "cheer rally"} <= tokens
+    assert near_dup.shingles({"title": "Bitcoin"}) == {"bitcoin"}
+    assert near_dup.shingles({}) == set()
+
+
+def test_collapse_keeps_first_and_lists_the_rest():
+    [gpt5, btc] = near_dup.collapse([GPT5, BTC, GPT5_AGAIN])
+    assert gpt5["link"] == GPT5["link"] and gpt5["also"] == [GPT5_AGAIN["link"]]
+    assert "also" not in btc
+
+
+def test_collapse_drops_stories_already_picked():
+    picked = near_dup.collapse([GPT5])
+    assert near_dup.collapse([BTC, GPT5_AGAIN], picked) == [BTC]
+    assert picked[0]["also"] == [GPT5_AGAIN["link"]]
@@ -0,0 +1,75 @@
+import pytest
+
+import outbox
+import telegram_delivery
+
+MESSAGE = "\n\n".join(f"*Sector {i}*\n" + "news " * 700 for i in range(3))
+
+
+class Reply:
+    def __init__(self, status_code: int, text: str = ""):
+        self.status_code = status_code
+        self.text = text
+
+
+@pytest.fixture
+def telegram(tmp_path, monkeypatch):
+    """Chunks Telegram accepted; set `fail` to {chunk number: status} to refuse calls."""
+    monkeypatch.setattr(outbox, "OUTBOX_DIR", str(tmp_path / "outbox"))
+    sent, fail = [], {}
+
+    def send_chunk(token, chat_id, text, deadline=None):
+        status = fail.pop(len(sent), 200)
+        if status == 200:
+            sent.append(text)
+        return Reply(status, "" if status == 200 else "nope")
+
+    monkeypatch.setattr(telegram_delivery, "send_chunk", send_chunk)
+    return sent, fail
+
+
+def test_message_is_split_into_several_chunks():
+    assert len(telegram_delivery.split_message(MESSAGE)) == 3
+
+
+def test_resumes_from_first_unsent_chunk(telegram):
+    sent, fail = telegram
+    entry = outbox.enqueue(1, MESSAGE)
+    fail[1] = 502
+    assert not outbox.send(entry, "token")
+    assert entry["sent"] == 1 and entry["attempts"] == 1
+
+    # A later run picks the entry up from disk and sends only what is missing.
+    [pending] = outbox.pending()
+    assert pending["sent"] == 1
+    assert outbox.send(pending, "token")
+    assert sent == entry["chunks"]
+    assert outbox.pending() == []
+
+
+def test_same_message_is_not_sent_twice(telegram):
+    sent, _ = telegram
+    assert outbox.send(outbox.enqueue(1, MESSAGE), "token")
+    again = outbox.enqueue(1, MESSAGE)
+    assert again["done"]
+    assert outbox.drain("token", entries=[again]) == []
+    assert len(sent) == 3
+    assert not outbox.enqueue(1, MESSAGE, resend=True)["done"]
+
+
+def test_refused_chunk_kills_the_entry(telegram):
+    _, fail = telegram
+    entry = outbox.enqueue(1, MESSAGE)
+    fail[0] = 403
+    assert not outbox.send(entry, "token")
+    assert entry["dead"]
+    assert outbox.pending() == []
+
+
+def test_new_brief_supersedes_undelivered_one(telegram):
+    _, fail = telegram
+    old = outbox.enqueue(1, MESSAGE)
+    fail[0] = 502
+    outbox.send(old, "token")
+    new = outbox.enqueue(1, MESSAGE + "\n\nupdate")
+    assert [e["id"] for e in outbox.pending()] == [new["id"]]
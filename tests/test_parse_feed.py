@@ -0,0 +1,61 @@
+from morning_briefing import parse_feed
+
+RSS_HEAD = b'<?xml version="1.0"?><rss version="2.0"><channel><title>Feed</title>'
+ATOM_HEAD = b'<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom"><title>Feed</title>'
+
+
+def rss_item(i: int) -> bytes:
+    return (f"<item><title>Story {i}</title><link>https://example.com/{i}</link>"
+            f"<description>About story {i}.</description>"
+            f"<pubDate>Mon, 06 Jan 2025 08:00:00 GMT</pubDate></item>").encode()
+
+
+def atom_entry(i: int) -> bytes:
+    return (f'<entry><title>Story {i}</title><link href="https://example.com/{i}"/>'
+            f"<summary>About story {i}.</summary><updated>2025-01-06T08:00:00Z</updated></entry>").encode()
+
+
+def stream(chunks: list, pulled: list):
+    """Yield chunks, recording how many the parser asked for."""
+    for chunk in chunks:
+        pulled.append(chunk)
+        yield chunk
+
+
+def test_rss_items():
+    items = parse_feed([RSS_HEAD + rss_item(1) + rss_item(2) + b"</channel></rss>"], max_items=10)
+    assert [a["title"] for a in items] == ["Story 1", "Story 2"]
+    assert items[0]["link"] == "https://example.com/1"
+    assert items[0]["summary"] == "About story 1."
+    assert items[0]["published"] == 1736150400.0
+
+
+def test_atom_entries():
+    items = parse_feed([ATOM_HEAD + atom_entry(1) + atom_entry(2) + b"</feed>"], max_items=10)
+    assert [a["link"] for a in items] == ["https://example.com/1", "https://example.com/2"]
+    assert items[1]["summary"] == "About story 2."
+    assert items[1]["published"] == 1736150400.0
+
+
+def test_rss_stops_reading_at_max_items():
+    pulled = []
+    chunks = [RSS_HEAD] + [rss_item(i) for i in range(50)] + [b"</channel></rss>"]
+    items = parse_feed(stream(chunks, pulled), max_items=3)
+    assert [a["title"] for a in items] == ["Story 0", "Story 1", "Story 2"]
+    assert len(pulled) == 4
+
+
+def test_atom_stops_reading_at_max_items():
+    pulled = []
+    chunks = [ATOM_HEAD] + [atom_entry(i) for i in range(50)] + [b"</feed>"]
+    items = parse_feed(stream(chunks, pulled), max_items=2)
+    assert len(items) == 2
+    assert len(pulled) == 3
+
+
+def test_stops_reading_at_max_bytes():
+    pulled = []
+    chunks = [RSS_HEAD] + [rss_item(i) for i in range(50)]
+    items = parse_feed(stream(chunks, pulled), max_items=100, max_bytes=len(RSS_HEAD) + 1)
+    assert len(pulled) == 2
+    assert len(items) == 1
@@ -0,0 +1,46 @@
+import pytest
+
+import ranking
+
+pytestmark = pytest.mark.skipif(not ranking.available(), reason="ranking needs NumPy")
+
+NOW = 1_700_000_000.0
+HOUR = 3600
+
+
+def article(title: str, age_hours: float = 1, summary: str = "") -> dict:
+    return {"title": title, "summary": summary, "published": NOW - age_hours * HOUR}
+
+
+def test_relevant_stories_rank_first():
+    generic = article("Celebrity chef opens a new restaurant downtown")
+    relevant = article("New telescope lets stargazing fans watch the eclipse from Tbilisi")
+    assert ranking.rank([generic, relevant], now=NOW) == [relevant, generic]
+
+
+def test_recency_decays_by_half_life():
+    fresh = article("Shopify adds checkout features", age_hours=0)
+    old = article("Shopify adds checkout features", age_hours=ranking.RANK_HALF_LIFE_HOURS)
+    s = ranking.scores([fresh, old], now=NOW)
+    assert s[1] == pytest.approx(s[0] / 2)
+
+
+def test_unknown_dates_count_as_a_day_old():
+    undated = {"title": "Shopify adds checkout features"}
+    dated = article("Shopify adds checkout features", age_hours=ranking.RANK_UNKNOWN_AGE)
+    s = ranking.scores([undated, dated], now=NOW)
+    assert s[0] == pytest.approx(s[1])
+
+
+def test_ties_keep_feed_order_and_top_n_cuts():
+    items = [article(f"Story number {i}") for i in range(5)]
+    assert ranking.rank(items, now=NOW) == items
+    assert ranking.rank(items, top_n=2, now=NOW) == items[:2]
+    assert ranking.rank(items[:1], top_n=3) == items[:1]
+
+
+def test_vectors_are_unit_rows():
+    x = ranking.vectors(["bitcoin tops a record", "", "nasa telescope nasa"])
+    norms = (x * x).sum(axis=1)
+    assert norms[0] == pytest.approx(1.0) and norms[2] == pytest.approx(1.0)
+    assert norms[1] == 0
@@ -0,0 +1,44 @@
+import sqlite3
+import time
+
+from seen_index import SeenIndex, article_keys, normalize_link, normalize_title
+
+
+def test_normalize_link_drops_noise():
+    assert normalize_link("https://www.Example.com/story/?utm_source=x&b=2&a=1#top") == "example.com/story?a=1&b=2"
+    assert normalize_link("http://example.com/story") == normalize_link("https://www.example.com/story/")
+
+
+def test_normalize_title():
+    assert normalize_title("  Bitcoin Tops $100,000!  ") == "bitcoin tops 100 000"
+
+
+def test_same_story_shares_keys():
+    a = {"title": "Bitcoin tops $100,000", "link": "https://www.example.com/btc?utm_medium=rss"}
+    b = {"title": "Something else", "link": "https://example.com/btc/"}
+    c = {"title": "bitcoin tops 100,000", "link": "https://other.example/btc"}
+    assert set(article_keys(a)) & set(article_keys(b))
+    assert set(article_keys(a)) & set(article_keys(c))
+    assert article_keys({}) == []
+
+
+def test_marked_articles_are_seen_across_runs(tmp_path):
+    path = str(tmp_path / "seen.sqlite3")
+    index = SeenIndex(path)
+    story = {"title": "NASA confirms Artemis date", "link": "https://nasa.example/artemis"}
+    assert not index.seen(story)
+    index.mark([story])
+    assert index.seen({"title": "A new headline", "link": "https://nasa.example/artemis/"})
+    index.close()
+    assert SeenIndex(path).seen(story)
+
+
+def test_expired_entries_are_forgotten(tmp_path):
+    path = str(tmp_path / "seen.sqlite3")
+    story = {"title": "Old story", "link": "https://example.com/old"}
+    index = SeenIndex(path, ttl_days=1)
+    index.mark([story])
+    index.close()
+    with sqlite3.connect(path) as db:
+        db.execute("UPDATE seen SET ts = ?", (time.time() - 2 * 86400,))
+    assert not SeenIndex(path, ttl_days=1).seen(story)
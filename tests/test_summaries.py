@@ -0,0 +1,82 @@
+import pytest
+
+import morning_briefing as mb
+
+AI, CRYPTO = "🤖 AI & Tech", "₿ Crypto & Finance"
+NEWS = {
+    AI: [{"title": "OpenAI ships a new reasoning model for developers", "link": "https://a.example/1",
+          "summary": "The model is available in the API today. Pricing drops by half."}],
+    CRYPTO: [{"title": "Bitcoin climbs above its previous record high", "link": "https://c.example/1",
+              "summary": "Spot ETF inflows drove the rally. Traders expect volatility."}],
+}
+
+
+class MemoryCache:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key, max_age=None):
+        return self.data.get(key)
+
+    def set(self, key, value):
+        self.data[key] = value
+
+
+@pytest.fixture
+def summaries(monkeypatch):
+    """The summary cache, with AI & Tech already summarized; set reply["text"] to answer OpenAI."""
+    cache = MemoryCache()
+    cache.set(mb._sector_key(AI, NEWS[AI]), f"*{AI}*\nCached AI summary.")
+    reply = {"text": ""}
+    monkeypatch.setattr(mb, "OPENAI_API_KEY", "test")
+    monkeypatch.setattr(mb, "_SUMMARIES", cache)
+    monkeypatch.setattr(mb, "_call_openai", lambda prompt, on_delta=None: reply["text"])
+    return reply
+
+
+def test_split_digest_on_exact_headers():
+    content = f"*{AI}*\nAI line.\n\n*{CRYPTO}*\nCrypto line.\n\n{mb.TAKEAWAY_HEADER}\nTakeaway."
+    blocks = mb._split_digest(content, [AI, CRYPTO])
+    assert blocks == {
+        AI: f"*{AI}*\nAI line.",
+        CRYPTO: f"*{CRYPTO}*\nCrypto line.",
+        mb.TAKEAWAY_HEADER: f"{mb.TAKEAWAY_HEADER}\nTakeaway.",
+    }
+
+
+@pytest.mark.parametrize("header", [f"**{CRYPTO}**", f"## {CRYPTO}", f"*{CRYPTO}:*", f"_{CRYPTO.upper()}_"])
+def test_split_digest_normalizes_decorated_headers(header):
+    blocks = mb._split_digest(f"{header}\nCrypto line.\n\n**💡 Today's Takeaway**\nTakeaway.", [AI, CRYPTO])
+    assert blocks[CRYPTO] == f"*{CRYPTO}*\nCrypto line."
+    assert blocks[mb.TAKEAWAY_HEADER] == f"{mb.TAKEAWAY_HEADER}\nTakeaway."
+
+
+def test_split_digest_without_headers():
+    assert mb._split_digest("Just some prose about the markets.", [AI, CRYPTO]) == {}
+
+
+def test_reply_is_merged_with_cached_sectors(summaries):
+    summaries["text"] = f"*{CRYPTO}*\nFresh crypto summary.\n\n{mb.TAKEAWAY_HEADER}\nTakeaway."
+    digest = mb.summarize_with_openai(NEWS, timeout=5)
+    assert digest == (f"*{AI}*\nCached AI summary.\n\n*{CRYPTO}*\nFresh crypto summary."
+                      f"\n\n{mb.TAKEAWAY_HEADER}\nTakeaway.")
+
+
+def test_decorated_reply_keeps_cached_sectors(summaries):
+    summaries["text"] = f"**{CRYPTO}**\nFresh crypto summary.\n\n**💡 Today's Takeaway:**\nTakeaway."
+    digest = mb.summarize_with_openai(NEWS, timeout=5)
+    assert digest.startswith(f"*{AI}*\nCached AI summary.\n\n*{CRYPTO}*\nFresh crypto summary.")
+
+
+def test_unsplittable_reply_keeps_cached_sectors(summaries):
+    summaries["text"] = "Crypto rallied today, and that is all I will say."
+    digest = mb.summarize_with_openai(NEWS, timeout=5)
+    assert digest.startswith(f"*{AI}*\nCached AI summary.")
+    assert f"*{CRYPTO}*" in digest            # summarized locally instead
+    assert "that is all I will say" not in digest
+
+
+def test_unsplittable_reply_is_used_when_nothing_is_cached(summaries, monkeypatch):
+    monkeypatch.setattr(mb, "_SUMMARIES", MemoryCache())
+    summaries["text"] = "Crypto rallied today."
+    assert mb.summarize_with_openai(NEWS, timeout=5) == "Crypto rallied today."
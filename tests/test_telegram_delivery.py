@@ -0,0 +1,38 @@
+from telegram_delivery import split_message, tg_len
+
+
+def test_short_message_is_one_chunk():
+    assert split_message("  *Brief*\nhello  ") == ["*Brief*\nhello"]
+    assert split_message("   ") == []
+
+
+def test_chunks_respect_limit_and_keep_text():
+    text = "\n\n".join(f"Paragraph {i}: " + "word " * 40 for i in range(20))
+    chunks = split_message(text, limit=300)
+    assert len(chunks) > 1
+    assert all(tg_len(c) <= 300 for c in chunks)
+    assert " ".join(" ".join(chunks).split()) == " ".join(text.split())
+
+
+def test_never_splits_inside_an_entity():
+    link = "[James Webb telescope spots water vapor](https://example.com/jwst)"
+    text = "filler " * 12 + link + " tail" * 10
+    for limit in range(len(link), 140, 7):
+        chunks = split_message(text, limit=limit)
+        assert any(link in c for c in chunks), limit
+
+
+def test_bold_span_moves_whole_to_next_chunk():
+    text = "a" * 50 + " *bold words that must stay together* end"
+    chunks = split_message(text, limit=70)
+    assert chunks[0] == "a" * 50
+    assert chunks[1].startswith("*bold words that must stay together*")
+
+
+def test_limit_counts_utf16_units():
+    text = " ".join(["🚀🌌"] * 300)   # each emoji is two UTF-16 units
+    chunks = split_message(text, limit=100)
+    assert all(tg_len(c) <= 100 for c in chunks)
+    assert all(len(c) < 60 for c in chunks)
+    assert "".join(chunks).replace(" ", "") == text.replace(" ", "")
+    assert tg_len("🚀") == 2 and tg_len("ქ") == 1